@@ -1,15 +1,385 @@
 import os
-import openai
-from openai import OpenAI
+import time
+import atexit
+import asyncio
+import logging
+import threading
+import collections
+import database as db
+import prompts
+import response_cache
+import resilience
+import singleflight
+from utils import get_affirmation
 
-# Initialize the OpenAI client
+logger = logging.getLogger(__name__)
+
+# The OpenAI client, and the openai package itself, are only loaded when the
+# first completion is requested, so pages that never call the AI do not pay
+# for them at startup. Retries are handled by the resilience layer below
+# rather than by the SDK, so that they respect our deadlines.
 openai_api_key = os.environ.get("OPENAI_API_KEY")
-client = OpenAI(api_key=openai_api_key)
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Return the shared OpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                _client = OpenAI(api_key=openai_api_key, max_retries=0)
+    return _client
 
 # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
 # do not change this unless explicitly requested by the user
 MODEL = "gpt-4o"
 
+# Identical requests are answered from a local cache instead of the API.
+# Affirmations asked for on demand are never cached, so every press gets a
+# new one; those generated for a given day get a shorter lifetime.
+CACHE_TTL_SECONDS = int(os.environ.get("AI_CACHE_TTL_SECONDS", 7 * 24 * 60 * 60))
+AFFIRMATION_CACHE_TTL_SECONDS = int(os.environ.get("AI_AFFIRMATION_CACHE_TTL_SECONDS", 60 * 60))
+CACHE_MEMORY_ENTRIES = int(os.environ.get("AI_CACHE_MEMORY_ENTRIES", 512))
+CACHE_DISK_ENTRIES = int(os.environ.get("AI_CACHE_DISK_ENTRIES", 10000))
+
+cache = response_cache.ResponseCache(
+    ttl_seconds=CACHE_TTL_SECONDS,
+    max_memory_entries=CACHE_MEMORY_ENTRIES,
+    max_disk_entries=CACHE_DISK_ENTRIES,
+)
+
+# Transient provider errors are retried with backoff, but a whole call,
+# retries included, never takes longer than REQUEST_TIMEOUT_SECONDS. During
+# an outage the circuit breaker opens and calls go straight to the local
+# fallback messages instead of waiting for the timeout.
+REQUEST_TIMEOUT_SECONDS = float(os.environ.get("AI_REQUEST_TIMEOUT_SECONDS", 30))
+MAX_ATTEMPTS = int(os.environ.get("AI_MAX_ATTEMPTS", 3))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("AI_BREAKER_FAILURE_THRESHOLD", 5))
+BREAKER_RECOVERY_SECONDS = float(os.environ.get("AI_BREAKER_RECOVERY_SECONDS", 30))
+
+breaker = resilience.CircuitBreaker(
+    failure_threshold=BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=BREAKER_RECOVERY_SECONDS,
+)
+
+# Concurrent identical requests that miss the cache share one API call
+flights = singleflight.SingleFlight()
+
+def _log_failure(function, error):
+    """Log why a generator fell back to a local message."""
+    if isinstance(error, resilience.CircuitOpenError):
+        logger.info("%s: circuit open, using the fallback message", function)
+    else:
+        logger.warning("%s failed, using the fallback message", function, exc_info=error)
+
+def _reframing_fallback():
+    return f"I had trouble generating a response right now. But know that I'm here for you, Boopie. ❤️ {get_affirmation()}"
+
+def _advice_fallback():
+    return f"I had trouble generating advice right now. But I'm here for you, Boopie. ❤️ {get_affirmation()}"
+
+# Recent completion timings, newest last. Time to first token is recorded
+# separately from total latency because it is what users perceive as waiting.
+# Calls that reached the API also record the tokens they were billed for;
+# calls that waited for an identical call in flight are marked coalesced.
+LATENCY_LOG_SIZE = 200
+latency_log = collections.deque(maxlen=LATENCY_LOG_SIZE)
+
+# Tokens billed since startup, per function
+token_usage = collections.defaultdict(collections.Counter)
+_token_usage_lock = threading.Lock()
+
+def _record_latency(function, started, first_token_at, finished, cached, streamed, usage=None,
+                    coalesced=False):
+    """Record how long a completion took to start and to finish."""
+    entry = {
+        "function": function,
+        "time_to_first_token": first_token_at - started,
+        "total": finished - started,
+        "cached": cached,
+        "streamed": streamed,
+        "coalesced": coalesced,
+        "prompt_tokens": usage.prompt_tokens if usage else 0,
+        "completion_tokens": usage.completion_tokens if usage else 0,
+    }
+    latency_log.append(entry)
+    if usage:
+        with _token_usage_lock:
+            token_usage[function].update(prompt_tokens=usage.prompt_tokens,
+                                         completion_tokens=usage.completion_tokens)
+    logger.info("%s: first token after %.3fs, done after %.3fs (cached=%s, streamed=%s, "
+                "coalesced=%s, prompt tokens=%d, completion tokens=%d)",
+                function, entry["time_to_first_token"], entry["total"], cached, streamed,
+                coalesced, entry["prompt_tokens"], entry["completion_tokens"])
+
+def _cached_completion(function, cache_input, messages, max_tokens, temperature, ttl_seconds=None):
+    """Return a chat completion, served from the response cache when possible.
+    
+    Args:
+        function (str): Name of the calling function, part of the cache key
+        cache_input (str): The user input the response depends on, or None
+            to neither cache the response nor share it with identical calls
+        messages (list): Chat messages to send on a cache miss
+        max_tokens (int): Completion token limit
+        temperature (float): Sampling temperature
+        ttl_seconds (float): Overrides the cache's default time to live
+        
+    Returns:
+        str: The completion text
+    """
+    started = time.perf_counter()
+    key = None
+    if cache_input is not None:
+        key = response_cache.make_key(function, MODEL, cache_input, temperature, max_tokens)
+        cached = cache.get(key, ttl_seconds)
+        if cached is not None:
+            finished = time.perf_counter()
+            _record_latency(function, started, finished, finished, cached=True, streamed=False)
+            return cached
+    
+    usage = None
+    made_request = False
+    
+    def request():
+        nonlocal usage, made_request
+        made_request = True
+        response = resilience.call_with_retry(
+            lambda timeout: get_client().chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout
+            ),
+            breaker,
+            deadline=REQUEST_TIMEOUT_SECONDS,
+            max_attempts=MAX_ATTEMPTS
+        )
+        usage = response.usage
+        text = response.choices[0].message.content.strip()
+        if key is not None:
+            cache.set(key, text)
+        return text
+    
+    text = request() if key is None else flights.do(key, request)
+    finished = time.perf_counter()
+    _record_latency(function, started, finished, finished, cached=False, streamed=False,
+                    usage=usage, coalesced=not made_request)
+    return text
+
+def _stream_completion(function, cache_input, messages, max_tokens, temperature, ttl_seconds=None):
+    """Yield a chat completion piece by piece as the tokens arrive.
+    
+    A cached response is yielded in one piece. A streamed response is only
+    cached once it has been received completely. Only opening the stream is
+    retried; once text has been shown a failure ends the stream. A caller
+    that asks while an identical request is already in flight waits for it
+    and gets the whole text in one piece, or makes the request itself if
+    the first caller stops reading before the end.
+    
+    Args:
+        function (str): Name of the calling function, part of the cache key
+        cache_input (str): The user input the response depends on, or None
+            to neither cache the response nor share it with identical calls
+        messages (list): Chat messages to send on a cache miss
+        max_tokens (int): Completion token limit
+        temperature (float): Sampling temperature
+        ttl_seconds (float): Overrides the cache's default time to live
+        
+    Yields:
+        str: The next piece of the completion text
+    """
+    started = time.perf_counter()
+    key = future = None
+    if cache_input is not None:
+        key = response_cache.make_key(function, MODEL, cache_input, temperature, max_tokens)
+        cached = cache.get(key, ttl_seconds)
+        if cached is not None:
+            finished = time.perf_counter()
+            _record_latency(function, started, finished, finished, cached=True, streamed=True)
+            yield cached
+            return
+        
+        future, leader = flights.claim(key)
+        while not leader:
+            try:
+                text = future.result()
+            except singleflight.Abandoned:
+                # Its caller stopped reading; make the call again
+                future, leader = flights.claim(key)
+                continue
+            finished = time.perf_counter()
+            _record_latency(function, started, finished, finished, cached=False, streamed=True,
+                            coalesced=True)
+            yield text
+            return
+    
+    first_token_at = None
+    usage = None
+    parts = []
+    outcome = {"error": singleflight.Abandoned("The shared completion was abandoned")}
+    stream = None
+    try:
+        stream = resilience.call_with_retry(
+            lambda timeout: get_client().chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                # The last chunk then reports the tokens used
+                stream_options={"include_usage": True},
+                timeout=timeout
+            ),
+            breaker,
+            deadline=REQUEST_TIMEOUT_SECONDS,
+            max_attempts=MAX_ATTEMPTS
+        )
+        
+        for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+                # Leading whitespace would otherwise be stripped only at the end
+                delta = delta.lstrip()
+            parts.append(delta)
+            yield delta
+        
+        text = "".join(parts).strip()
+        if key is not None:
+            cache.set(key, text)
+        outcome = {"result": text}
+    except Exception as e:
+        # call_with_retry() has recorded failures to open the stream; only
+        # a failure while reading it is left to record
+        if stream is not None and resilience.is_retryable(e):
+            breaker.record_failure()
+        outcome = {"error": e}
+        raise
+    finally:
+        # Also reached when the caller stops reading early
+        if future is not None:
+            flights.release(key, future, **outcome)
+    
+    finished = time.perf_counter()
+    _record_latency(function, started, first_token_at or finished, finished, cached=False,
+                    streamed=True, usage=usage)
+
+def _reframing_request(original_thought, fresh=False):
+    """Build the completion request for reframing an overthinking thought.
+    
+    A fresh reframing is never cached or shared, so it is always new.
+    """
+    messages, original_thought = prompts.REFRAMING.messages(original_thought)
+    return {
+        "function": "generate_thought_reframing",
+        "cache_input": None if fresh else original_thought,
+        "messages": messages,
+        "max_tokens": 150,
+        "temperature": 0.7,
+    }
+
+def _affirmation_request(for_date=None, user_id=db.DEFAULT_USER_ID):
+    """Build the completion request for a personalized affirmation.
+    
+    Affirmations for a given day are cached for that day and user, so every
+    user gets their own. One asked for on demand, without a day, is never
+    cached or shared, so asking again gives a new affirmation rather than
+    the last one.
+    """
+    messages, _ = prompts.AFFIRMATION.messages()
+    return {
+        "function": "generate_custom_affirmation",
+        "cache_input": f"{user_id} {for_date.isoformat()}" if for_date else None,
+        "messages": messages,
+        "max_tokens": 60,
+        "temperature": 0.8,
+        "ttl_seconds": AFFIRMATION_CACHE_TTL_SECONDS,
+    }
+
+def _advice_request(situation):
+    """Build the completion request for advice on a specific situation."""
+    messages, situation = prompts.ADVICE.messages(situation)
+    return {
+        "function": "generate_personalized_advice",
+        "cache_input": situation,
+        "messages": messages,
+        "max_tokens": 200,
+        "temperature": 0.7,
+    }
+
+# Reuse of past reframings: the reframing page first looks for a thought in
+# the user's journal that uses nearly the same words, using the local journal
+# vectors (see themes.py), and offers its reframing instantly instead of
+# calling the API. The threshold is the minimum cosine similarity of the two
+# thoughts, from 0 to 1; above 1 disables reuse.
+REFRAMING_REUSE_THRESHOLD = float(os.environ.get("AI_REFRAMING_REUSE_THRESHOLD", 0.8))
+
+reuse_stats = collections.Counter()
+_reuse_stats_lock = threading.Lock()
+
+def find_past_reframing(original_thought, user_id=db.DEFAULT_USER_ID, threshold=None):
+    """Find a reframing in the user's journal of a thought like this one.
+    
+    Args:
+        original_thought (str): The thought about to be reframed
+        user_id (str): The user whose journal to search
+        threshold (float): Overrides ``REFRAMING_REUSE_THRESHOLD``
+        
+    Returns:
+        dict: The closest journal entry with its ``similarity`` added, or
+        None if no entry is similar enough
+    """
+    # Imported here so that loading this module does not load NumPy
+    import themes
+    
+    threshold = REFRAMING_REUSE_THRESHOLD if threshold is None else threshold
+    if threshold > 1 or not original_thought.strip():
+        return None
+    
+    matches = themes.find_similar_entries(themes.update_vectors(user_id), original_thought)
+    entry = None
+    if matches and matches[0][1] >= threshold:
+        entry = db.get_thought_entry(matches[0][0], user_id)
+    with _reuse_stats_lock:
+        reuse_stats["lookups"] += 1
+        reuse_stats["hits"] += entry is not None
+    if entry is None:
+        return None
+    entry["similarity"] = matches[0][1]
+    logger.info("Found a past reframing %.2f similar to the thought (%s)", entry["similarity"],
+                reuse_report())
+    return entry
+
+def record_declined_reuse():
+    """Record that a past reframing was offered but a new one was asked for anyway."""
+    with _reuse_stats_lock:
+        reuse_stats["declined"] += 1
+
+def reuse_report():
+    """Report how often past reframings were found and used.
+    
+    Returns:
+        dict: Reuse ``lookups`` and ``hits``, the ``hit_rate`` and the
+        ``api_calls_avoided``, i.e. hits where no new reframing was asked for
+    """
+    with _reuse_stats_lock:
+        lookups, hits, declined = reuse_stats["lookups"], reuse_stats["hits"], reuse_stats["declined"]
+    return {
+        "lookups": lookups,
+        "hits": hits,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "api_calls_avoided": hits - declined,
+    }
+
 def generate_thought_reframing(original_thought):
     """Generate an AI-powered reframing of an overthinking thought.
     
@@ -22,35 +392,36 @@ def generate_thought_reframing(original_thought):
     try:
         if not original_thought.strip():
             return ""
-            
-        prompt = f"""
-        As Krish (Bean) talking to your girlfriend Hiya (Boopie), provide a kind, thoughtful reframing of this overthinking thought. 
-        She attends Purdue University, while you go to Penn State. You often joke that Penn State is better.
-        She lives in West Lafayette. You both want to travel to Paris and Greece someday.
-        Her favorite song is "ilym" by John K. You gave her a bunny plushie named Daisy.
-        She gave you a bat plushie named Drax. You started dating on June 27, 2024.
-        
-        Use personal details, inside jokes, and warm reassurance. Speak as if you're talking directly to her.
-        Keep your response to 3-4 sentences maximum. Be warm, loving, and supportive.
-        
-        Her overthinking thought: "{original_thought}"
-        
-        Your reframing as Bean:
-        """
-        
-        response = client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": "You are a supportive, loving boyfriend helping your girlfriend reframe anxious thoughts."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=150,
-            temperature=0.7
-        )
         
-        return response.choices[0].message.content.strip()
+        return _cached_completion(**_reframing_request(original_thought))
     except Exception as e:
-        return f"I had trouble generating a response right now. But know that I'm here for you, Boopie. ❤️ Error: {str(e)}"
+        _log_failure("generate_thought_reframing", e)
+        return _reframing_fallback()
+
+def stream_thought_reframing(original_thought, fresh=False):
+    """Stream an AI-powered reframing of an overthinking thought.
+    
+    Args:
+        original_thought (str): The original thought to reframe
+        fresh (bool): Ask the API for a new reframing even if this thought
+            was reframed before, rather than reusing the cached one
+        
+    Yields:
+        str: Pieces of a supportive reframing of the thought, as they arrive
+    """
+    if not original_thought.strip():
+        return
+    
+    received = False
+    try:
+        for piece in _stream_completion(**_reframing_request(original_thought, fresh)):
+            received = True
+            yield piece
+    except Exception as e:
+        _log_failure("stream_thought_reframing", e)
+        # Keep whatever already arrived rather than replacing it
+        if not received:
+            yield _reframing_fallback()
 
 def generate_custom_affirmation():
     """Generate an AI-powered personalized affirmation from Bean to Boopie.
@@ -59,29 +430,10 @@ def generate_custom_affirmation():
         str: A personalized affirmation
     """
     try:
-        prompt = """
-        Create a single personalized affirmation from Krish (Bean) to his girlfriend Hiya (Boopie).
-        Include a specific personal detail, like the fact that they both have trypophobia, 
-        they want a husky in the future, her hazel eyes, she loves Kinder Joy,
-        she loves Lord of the Rings, they started dating June 27, 2024, or her long beautiful hair.
-        
-        Make it affirming, supportive, and loving with a touch of humor or playfulness.
-        Keep it short (15-25 words maximum).
-        """
-        
-        response = client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": "You are a supportive, loving boyfriend creating affirming messages for your girlfriend."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=60,
-            temperature=0.8
-        )
-        
-        return response.choices[0].message.content.strip()
+        return _cached_completion(**_affirmation_request())
     except Exception as e:
-        return "Your Bean loves you, Boopie. Always and forever. ❤️"
+        _log_failure("generate_custom_affirmation", e)
+        return get_affirmation()
 
 def generate_personalized_advice(situation):
     """Generate personalized advice for a specific situation.
@@ -95,32 +447,248 @@ def generate_personalized_advice(situation):
     try:
         if not situation.strip():
             return ""
-            
-        prompt = f"""
-        As Krish (Bean) talking to your girlfriend Hiya (Boopie), provide personalized advice for this situation.
-        She attends Purdue University, while you go to Penn State. You often joke that Penn State is better.
-        She lives in West Lafayette. You both want to travel to Paris and Greece someday.
-        Her favorite song is "ilym" by John K. You gave her a bunny plushie named Daisy.
-        She gave you a bat plushie named Drax. You started dating on June 27, 2024.
-        
-        Use personal details, inside jokes, and warm reassurance. Speak as if you're talking directly to her.
-        Give practical, helpful advice while being supportive. Keep your response to 3-5 sentences.
-        
-        Situation: "{situation}"
-        
-        Your advice as Bean:
-        """
-        
-        response = client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": "You are a supportive, loving boyfriend giving personalized advice."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=200,
-            temperature=0.7
+        
+        return _cached_completion(**_advice_request(situation))
+    except Exception as e:
+        _log_failure("generate_personalized_advice", e)
+        return _advice_fallback()
+
+def stream_personalized_advice(situation):
+    """Stream personalized advice for a specific situation.
+    
+    Args:
+        situation (str): The situation or feeling to address
+        
+    Yields:
+        str: Pieces of personalized advice, as they arrive
+    """
+    if not situation.strip():
+        return
+    
+    received = False
+    try:
+        for piece in _stream_completion(**_advice_request(situation)):
+            received = True
+            yield piece
+    except Exception as e:
+        _log_failure("stream_personalized_advice", e)
+        # Keep whatever already arrived rather than replacing it
+        if not received:
+            yield _advice_fallback()
+
+# Async API
+#
+# The async functions run on one background event loop shared by the whole
+# process. That loop owns a single AsyncOpenAI client, so every request
+# reuses the same keep-alive connection pool, and a semaphore caps how many
+# requests are in flight at once no matter how many sessions are generating.
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("AI_MAX_CONCURRENT_REQUESTS", 8))
+HTTP_MAX_CONNECTIONS = MAX_CONCURRENT_REQUESTS
+HTTP_KEEPALIVE_SECONDS = 60
+
+class _AsyncRuntime:
+    """The shared event loop, async client and concurrency limit."""
+    
+    def __init__(self):
+        import httpx
+        import openai
+        
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever,
+                                       name="ai-helper-async", daemon=True)
+        self.thread.start()
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self.client = openai.AsyncOpenAI(
+            api_key=openai_api_key,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            max_retries=0,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_SECONDS,
+                ),
+            ),
+        )
+    
+    def close(self):
+        """Close the client's connections and stop the loop."""
+        if self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.client.close(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+_async_runtime = None
+_async_runtime_lock = threading.Lock()
+
+def _get_async_runtime():
+    global _async_runtime
+    if _async_runtime is None:
+        with _async_runtime_lock:
+            if _async_runtime is None:
+                _async_runtime = _AsyncRuntime()
+    return _async_runtime
+
+@atexit.register
+def _close_async_runtime():
+    global _async_runtime
+    with _async_runtime_lock:
+        if _async_runtime is not None:
+            _async_runtime.close()
+            _async_runtime = None
+
+def run_async(coro):
+    """Run a coroutine on the shared event loop and wait for its result.
+    
+    This is how synchronous code, such as a Streamlit script, calls the async
+    API.
+    
+    Args:
+        coro: The coroutine to run, e.g. ``agenerate_custom_affirmation()``
+        
+    Returns:
+        The coroutine's result
+    """
+    runtime = _get_async_runtime()
+    return asyncio.run_coroutine_threadsafe(coro, runtime.loop).result()
+
+async def _on_shared_loop(coro):
+    """Await a coroutine on the shared event loop from any event loop."""
+    runtime = _get_async_runtime()
+    if asyncio.get_running_loop() is runtime.loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, runtime.loop))
+
+async def _acached_completion(function, cache_input, messages, max_tokens, temperature,
+                              ttl_seconds=None, timeout=None):
+    """Async version of ``_cached_completion()``.
+    
+    The timeout is the deadline for the whole call: waiting for a free
+    request slot, every attempt and the backoff between them.
+    """
+    started = time.perf_counter()
+    deadline_at = time.monotonic() + (timeout or REQUEST_TIMEOUT_SECONDS)
+    key = future = None
+    if cache_input is not None:
+        key = response_cache.make_key(function, MODEL, cache_input, temperature, max_tokens)
+        cached = cache.get(key, ttl_seconds)
+        if cached is not None:
+            finished = time.perf_counter()
+            _record_latency(function, started, finished, finished, cached=True, streamed=False)
+            return cached
+        
+        # Share the in-flight call with sync callers too. Waiting for it is
+        # bounded by this caller's own deadline; shielded so giving up does
+        # not cancel the call for everyone else. If the caller making it is
+        # cancelled instead, this one makes the call itself.
+        future, leader = flights.claim(key)
+        while not leader:
+            try:
+                text = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)),
+                                              deadline_at - time.monotonic())
+            except singleflight.Abandoned:
+                future, leader = flights.claim(key)
+                continue
+            finished = time.perf_counter()
+            _record_latency(function, started, finished, finished, cached=False, streamed=False,
+                            coalesced=True)
+            return text
+    
+    runtime = _get_async_runtime()
+    
+    async def request(timeout):
+        async with runtime.semaphore:
+            return await runtime.client.chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout
+            )
+    
+    try:
+        response = await resilience.acall_with_retry(
+            lambda timeout: asyncio.wait_for(request(timeout), timeout),
+            breaker,
+            deadline=deadline_at - time.monotonic(),
+            max_attempts=MAX_ATTEMPTS
         )
+        text = response.choices[0].message.content.strip()
+        if key is not None:
+            cache.set(key, text)
+    except BaseException as e:
+        if future is not None:
+            flights.release(key, future, error=e)
+        raise
+    if future is not None:
+        flights.release(key, future, text)
+    finished = time.perf_counter()
+    _record_latency(function, started, finished, finished, cached=False, streamed=False,
+                    usage=response.usage)
+    return text
+
+async def agenerate_thought_reframing(original_thought, timeout=None):
+    """Async version of ``generate_thought_reframing()``.
+    
+    Args:
+        original_thought (str): The original thought to reframe
+        timeout (float): Seconds to wait before giving up, defaults to
+            ``REQUEST_TIMEOUT_SECONDS``
+        
+    Returns:
+        str: A supportive reframing of the thought
+    """
+    try:
+        if not original_thought.strip():
+            return ""
+        
+        return await _on_shared_loop(
+            _acached_completion(**_reframing_request(original_thought), timeout=timeout))
+    except Exception as e:
+        _log_failure("agenerate_thought_reframing", e)
+        return _reframing_fallback()
+
+async def agenerate_custom_affirmation(timeout=None, for_date=None, fallback=True,
+                                       user_id=db.DEFAULT_USER_ID):
+    """Async version of ``generate_custom_affirmation()``.
+    
+    Args:
+        timeout (float): Seconds to wait before giving up, defaults to
+            ``REQUEST_TIMEOUT_SECONDS``
+        for_date (datetime.date): The day the affirmation is meant for, if any
+        fallback (bool): Return a local affirmation instead of raising when
+            generation fails
+        user_id (str): The user the affirmation is for
+        
+    Returns:
+        str: A personalized affirmation
+    """
+    try:
+        return await _on_shared_loop(
+            _acached_completion(**_affirmation_request(for_date, user_id), timeout=timeout))
+    except Exception as e:
+        if not fallback:
+            raise
+        _log_failure("agenerate_custom_affirmation", e)
+        return get_affirmation()
+
+async def agenerate_personalized_advice(situation, timeout=None):
+    """Async version of ``generate_personalized_advice()``.
+    
+    Args:
+        situation (str): The situation or feeling to address
+        timeout (float): Seconds to wait before giving up, defaults to
+            ``REQUEST_TIMEOUT_SECONDS``
+        
+    Returns:
+        str: Personalized advice
+    """
+    try:
+        if not situation.strip():
+            return ""
         
-        return response.choices[0].message.content.strip()
+        return await _on_shared_loop(
+            _acached_completion(**_advice_request(situation), timeout=timeout))
     except Exception as e:
-        return f"I had trouble generating advice right now. But I'm here for you, Boopie. ❤️ Error: {str(e)}"
\ No newline at end of file
+        _log_failure("agenerate_personalized_advice", e)
+        return _advice_fallback()
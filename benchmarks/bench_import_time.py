@@ -0,0 +1,97 @@
+"""Measure the import cost of the app's modules, i.e. its cold start.
+
+Imports each module in a fresh interpreter under ``python -X importtime``
+and reports its cumulative import time and the slowest modules it pulled
+in. Streamlit is imported first and not counted, since the server has
+already loaded it before it runs app.py; what is left is what a cold app
+process pays on top of that to show a page.
+
+Save a run with ``--save`` and compare a later one against it with
+``--compare`` to track startup cost over time:
+
+    python benchmarks/bench_import_time.py --save startup.json
+    python benchmarks/bench_import_time.py --compare startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What each page imports on a cold start, on top of what app.py imports
+MODULES = [
+    'database',
+    'ai_helper',
+    'views.home',
+    'views.breathing',
+    'views.grounding',
+    'views.reframing',
+    'views.journal',
+]
+
+PRELOADED = 'streamlit'
+
+def import_times(module):
+    """Import a module in a fresh interpreter and return its import times.
+
+    Returns:
+        dict: Cumulative import time in microseconds of every module that
+        was imported, keyed by module name
+    """
+    env = dict(os.environ, OPENAI_API_KEY=os.environ.get('OPENAI_API_KEY', 'benchmark'))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {PRELOADED}; import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    preloaded = True
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        # Everything up to and including the preloaded package is its cost
+        if preloaded:
+            preloaded = name != PRELOADED
+            continue
+        times[name] = int(cumulative)
+    return times
+
+def measure(module, repeat):
+    """Return the median cumulative import time of a module and its slowest imports."""
+    runs = [import_times(module) for _ in range(repeat)]
+    total = statistics.median(run.get(module, 0) for run in runs)
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+    return total, [name for name, _ in slowest if name != module][:3]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='PATH', help='write the results to a JSON file')
+    parser.add_argument('--compare', metavar='PATH', help='compare against a saved JSON file')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'module':<18} {'import':>9} {'change':>9}  slowest imports")
+    for module in MODULES:
+        total, slowest = measure(module, args.repeat)
+        results[module] = total
+        change = ''
+        if module in baseline:
+            change = f"{(total - baseline[module]) / 1000:+.1f}ms"
+        print(f"{module:<18} {total / 1000:>7.1f}ms {change:>9}  {', '.join(slowest)}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark journal backups on a large journal.
+
+Restores a generated backup of journal entries and daily messages into an
+empty database with ``journal_io.restore()``, then exports it again in each
+format with ``journal_io.export()``. Reports the time of each and the peak
+Python memory it needed, which should stay flat as the journal grows.
+Memory is traced in a second run of each step, since tracing slows it down.
+
+Usage:
+    python benchmarks/bench_journal_io.py [--rows 1000000] [--messages 1000]
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+import journal_io
+
+def write_backup(path, rows, messages):
+    """Write a JSONL backup with one journal entry per ten minutes."""
+    start = datetime.datetime(2020, 1, 1)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(rows):
+            created = (start + datetime.timedelta(minutes=10 * i)).strftime('%Y-%m-%d %H:%M:%S')
+            f.write(json.dumps({
+                'table': 'thought_journal',
+                'original_thought': f'I am worried about the exam number {i}',
+                'reframed_thought': f'You studied hard for exam {i}, Boopie',
+                'reframing_method': 'ai-suggested' if i % 3 else 'self-guided',
+                'created_at': created,
+            }) + '\n')
+        for i in range(messages):
+            created = (start + datetime.timedelta(days=i)).strftime('%Y-%m-%d %H:%M:%S')
+            f.write(json.dumps({'table': 'daily_messages', 'message': f'Message {i}',
+                                'created_at': created}) + '\n')
+
+def measure(fn):
+    """Return the wall time in seconds and peak traced memory in MiB of a step.
+
+    The step is called twice, untraced and then traced, with the run number.
+    """
+    started = time.perf_counter()
+    fn(0)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    fn(1)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--messages', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close_pool()
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        db.init_db()
+
+        source = os.path.join(tmp, 'source.jsonl')
+        write_backup(source, args.rows, args.messages)
+        total = args.rows + args.messages
+
+        def restore(run):
+            # The traced run restores for another user, leaving the first
+            # user's journal as it was for the exports
+            with open(source, encoding='utf-8') as f:
+                journal_io.restore(f, 'jsonl', user_id=f'user{run}')
+
+        print(f"{'step':<14} {'time':>8} {'rows/s':>10} {'peak memory':>12} {'file':>9}")
+        elapsed, peak = measure(restore)
+        print(f"{'import jsonl':<14} {elapsed:>7.1f}s {total / elapsed:>10,.0f} {peak:>10.1f}MiB "
+              f"{os.path.getsize(source) / 2**20:>6.0f}MiB")
+
+        for format in journal_io.FORMATS:
+            target = os.path.join(tmp, f'export.{format}')
+
+            def export(run):
+                with open(target, 'w', encoding='utf-8', newline='') as f:
+                    journal_io.export(f, format, user_id='user0')
+
+            elapsed, peak = measure(export)
+            print(f"{'export ' + format:<14} {elapsed:>7.1f}s {total / elapsed:>10,.0f} "
+                  f"{peak:>10.1f}MiB {os.path.getsize(target) / 2**20:>6.0f}MiB")
+
+        db.close_pool()
+
+if __name__ == '__main__':
+    main()
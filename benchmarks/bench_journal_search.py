@@ -0,0 +1,114 @@
+"""Benchmark journal search on a large thought_journal table.
+
+Compares a ``LIKE '%word%'`` scan over both text columns with
+``database.search_thought_entries()``, which looks the words up in the
+full-text index, for a few queries of different selectivity. Every entry is
+made of the same 20 words, so most queries match a large share of the
+journal: the worst case for ranking.
+
+The large journal is then searched again by another user with only
+``--small-journal`` entries, which should not pay for the large journal.
+
+Usage:
+    python benchmarks/bench_journal_search.py [--rows 300000] [--small-journal 50] [--repeat 20]
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+
+LIKE_QUERY = '''
+SELECT id, original_thought, reframed_thought, reframing_method, created_at
+FROM thought_journal
+WHERE user_id = ? AND (original_thought LIKE ? OR reframed_thought LIKE ?)
+ORDER BY created_at DESC
+LIMIT ?
+'''
+
+WORDS = ('exam presentation friend family sleep future work class money health '
+         'nervous worried tired proud hopeful afraid calm ready grateful stuck').split()
+
+QUERIES = ['presentation', 'worried exam', 'grat', 'purple elephant']
+
+SMALL_USER_ID = 'small'
+
+def populate(conn, rows, user_id=db.DEFAULT_USER_ID, seed=0):
+    """Fill a user's journal with random entries, one per minute."""
+    rng = random.Random(seed)
+    start = datetime.datetime(2024, 1, 1)
+
+    def generate():
+        for i in range(rows):
+            original = ' '.join(rng.choices(WORDS, k=12))
+            reframed = ' '.join(rng.choices(WORDS, k=12))
+            created = (start + datetime.timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S')
+            yield (user_id, original, reframed, 'self-guided', created)
+
+    conn.executemany('''
+    INSERT INTO thought_journal (user_id, original_thought, reframed_thought, reframing_method,
+                                 created_at)
+    VALUES (?, ?, ?, ?, ?)
+    ''', generate())
+    conn.commit()
+
+def time_call(fn, repeat):
+    """Return the mean wall time of a call in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=300_000)
+    parser.add_argument('--small-journal', type=int, default=50,
+                        help='entries of the user searching next to the large journal')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close_pool()
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        db.init_db()
+
+        with db.pooled_connection() as conn:
+            print(f"Inserting {args.rows:,} rows...")
+            populate(conn, args.rows)
+            populate(conn, args.small_journal, SMALL_USER_ID, seed=1)
+
+            print(f"\n{'query':<18} {'LIKE scan':>10} {'search':>10} {'matches':>8}")
+            for query in QUERIES:
+                pattern = f"%{query.split()[0]}%"
+
+                def like():
+                    conn.execute(LIKE_QUERY, (db.DEFAULT_USER_ID, pattern, pattern,
+                                              db.JOURNAL_PAGE_SIZE)).fetchall()
+
+                def search():
+                    db.search_thought_entries(query)
+
+                matches = len(db.search_thought_entries(query, page_size=args.rows)[0])
+                print(f"{query:<18} {time_call(like, args.repeat):>8.2f}ms "
+                      f"{time_call(search, args.repeat):>8.2f}ms {matches:>8,}")
+
+            print(f"\nA journal of {args.small_journal:,} entries next to the large one:")
+            print(f"{'query':<18} {'search':>10} {'matches':>8}")
+            for query in QUERIES:
+                def search():
+                    db.search_thought_entries(query, user_id=SMALL_USER_ID)
+
+                matches = len(db.search_thought_entries(query, page_size=args.rows,
+                                                        user_id=SMALL_USER_ID)[0])
+                print(f"{query:<18} {time_call(search, args.repeat):>8.2f}ms {matches:>8,}")
+
+        db.close_pool()
+
+if __name__ == '__main__':
+    main()
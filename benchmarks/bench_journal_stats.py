@@ -0,0 +1,87 @@
+"""Benchmark journal statistics on a large thought_journal table.
+
+Compares counting entries per week and method with a GROUP BY over the
+journal itself, which reads every entry, with
+``database.get_journal_rollups()``, which reads the rollup rows the
+triggers maintain. Also reports what the triggers add to each insert.
+
+Usage:
+    python benchmarks/bench_journal_stats.py [--rows 300000] [--repeat 20]
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+
+SCAN_QUERY = '''
+SELECT date(created_at, 'weekday 0', '-6 days') AS week, reframing_method, count(*) AS entries
+FROM thought_journal
+WHERE user_id = ?
+GROUP BY 1, 2
+ORDER BY 1
+'''
+
+def populate(conn, rows):
+    """Fill thought_journal with random entries, one per ten minutes."""
+    rng = random.Random(0)
+    start = datetime.datetime(2020, 1, 1)
+
+    def generate():
+        for i in range(rows):
+            created = (start + datetime.timedelta(minutes=10 * i)).strftime('%Y-%m-%d %H:%M:%S')
+            method = rng.choice(['self-guided', 'ai-suggested'])
+            yield ('original thought', 'reframed thought', method, created)
+
+    conn.executemany('''
+    INSERT INTO thought_journal (original_thought, reframed_thought, reframing_method, created_at)
+    VALUES (?, ?, ?, ?)
+    ''', generate())
+    conn.commit()
+
+def time_call(fn, repeat):
+    """Return the mean wall time of a call in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=300_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close_pool()
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        db.init_db()
+
+        with db.pooled_connection() as conn:
+            print(f"Inserting {args.rows:,} rows...")
+            started = time.perf_counter()
+            populate(conn, args.rows)
+            print(f"  {(time.perf_counter() - started) / args.rows * 1e6:.1f}us per row, "
+                  f"rollups included")
+
+            def scan():
+                conn.execute(SCAN_QUERY, (db.DEFAULT_USER_ID,)).fetchall()
+
+            def rollups():
+                db.get_journal_rollups('week')
+
+            weeks = len(db.get_journal_rollups('week'))
+            print(f"\n{'GROUP BY scan':>14} {'rollups':>10} {'rows read':>10}")
+            print(f"{time_call(scan, args.repeat):>12.2f}ms {time_call(rollups, args.repeat):>8.2f}ms "
+                  f"{weeks:>10,}")
+
+        db.close_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+"""End-to-end benchmark of every page, compared against a saved baseline.
+
+Drives each page through ``streamlit.testing.v1.AppTest`` the way a user
+would: open it, type, press its buttons. Every step is one rerun of the
+app, and for each the suite records
+
+* the time app.py took to run, without AppTest's own overhead
+* how many database connections it borrowed (the queries it made)
+* how many requests it sent to the OpenAI API
+
+The API is ``fake_openai.FakeOpenAI``, a local stub with a configurable
+delay and error rate, so the numbers do not depend on the network and no
+key is needed. Each repetition starts from a fresh database holding a few
+journal entries and no message for today, with the response cache empty.
+
+Results are compared with ``bench_pages_baseline.json`` next to this
+script: a step that makes more queries or API calls than the baseline, or
+whose median time grew by more than ``--tolerance`` (and at least
+``--min-slowdown-ms``), is a regression and the script exits with status 1.
+Timings depend on the machine, so save a baseline on the machine you
+compare on before changing the code:
+
+    python benchmarks/bench_pages.py --save
+    python benchmarks/bench_pages.py
+    python benchmarks/bench_pages.py --pages reframing --latency 0.2 --error-rate 0.2
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from fake_openai import FakeOpenAI
+
+BASELINE = os.path.join(HERE, 'bench_pages_baseline.json')
+
+def click(key=None, label=None):
+    """Return a step action pressing a button, found by key or label."""
+    def action(at):
+        if key is not None:
+            at.button(key=key).click()
+        else:
+            next(button for button in at.button if button.label == label).click()
+    return action
+
+def type_into(text, key=None, label=None, index=None):
+    """Return a step action typing into a text area or input."""
+    def action(at):
+        if key is not None:
+            widget = next(w for w in list(at.text_area) + list(at.text_input) if w.key == key)
+        elif label is not None:
+            widget = next(w for w in at.text_area if w.label == label)
+        else:
+            widget = at.text_area[index]
+        widget.input(text)
+    return action
+
+def choose(key, value):
+    """Return a step action picking a radio option."""
+    def action(at):
+        at.radio(key=key).set_value(value)
+    return action
+
+def type_everywhere(text):
+    """Return a step action typing into every text area of the page."""
+    def action(at):
+        for text_area in at.text_area:
+            text_area.input(text)
+    return action
+
+THOUGHT = "I am going to fail my chemistry midterm and everyone will know"
+
+# What a user does on each page, one rerun per step; None just reruns
+SCENARIOS = {
+    'home': [
+        ('open', None),
+        ('rerun', None),
+        ('daily message', click(key='daily_message_btn')),
+        ('show message', None),
+    ],
+    'breathing': [
+        ('open', None),
+        ('next breath', click(label='Next Breath')),
+        ('rerun', None),
+    ],
+    'grounding': [
+        ('open', None),
+        ('type', type_everywhere("The smell of coffee and the sound of rain")),
+        ('grounded', click(label='I feel more grounded')),
+    ],
+    'reframing': [
+        ('open', None),
+        ('type thought', type_into(THOUGHT, index=0)),
+        ('choose Bean', choose('tab_selection', "Bean's AI Suggestion")),
+        ('reframe', click(key='ai_reframe')),
+        ('reframe again', click(key='ai_reframe')),
+        ('self-guided', choose('tab_selection', "Self-Guided Reframing")),
+        ('type reframing', type_into("I have passed hard exams before",
+                                     label="Write your reframed thought here:")),
+        ('save', click(key='save_self')),
+    ],
+    'journal': [
+        ('open', None),
+        ('search', type_into("exam", key='journal_search')),
+        ('clear search', type_into("", key='journal_search')),
+        ('load more', click(key='journal_load_more')),
+        ('affirmation', click(key='get_affirmation')),
+        ('type situation', type_into("My presentation is tomorrow", label="What's on your mind?")),
+        ('advice', click(key='get_advice')),
+    ],
+}
+
+PAGES = list(SCENARIOS)
+
+SEED_ENTRIES = 30
+
+def timed_script(code, timings):
+    """Run app.py's compiled code as the script, recording how long it took."""
+    # AppTest runs this function from its source, so it imports for itself
+    import time
+    started = time.perf_counter()
+    try:
+        exec(code, {'__name__': '__main__'})
+    finally:
+        timings.append((time.perf_counter() - started) * 1000)
+
+def counted_connections(db, counts):
+    """Wrap ``database.pooled_connection()`` so every call is counted."""
+    pooled_connection = db.pooled_connection
+
+    def counted():
+        counts.append(1)
+        return pooled_connection()
+
+    db.pooled_connection = counted
+
+def fresh_state(db, ai_helper, tmp, repetition):
+    """Point the app at a new database with a few entries and empty caches."""
+    db.close_pool()
+    db.DB_PATH = os.path.join(tmp, f'bench{repetition}.db')
+    for i in range(SEED_ENTRIES):
+        db.save_thought_entry(f"I worried about exam {i}", f"Exam {i} went fine", "self-guided")
+    ai_helper.cache.clear()
+    ai_helper.breaker.record_success()
+
+def run_scenario(page, code, api, counts):
+    """Walk through a page's scenario once.
+
+    Returns:
+        list: ``(step, ms, queries, api_calls)`` for every step
+    """
+    from streamlit.testing.v1 import AppTest
+
+    timings = []
+    at = AppTest.from_function(timed_script, args=(code, timings), default_timeout=60)
+    at.session_state.current_page = page
+    results = []
+    for step, action in SCENARIOS[page]:
+        if action is not None:
+            action(at)
+        del counts[:]
+        calls = api.total_calls()
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{page} page, step {step!r} raised: {at.exception[0].message}")
+        results.append((step, timings[-1], len(counts), api.total_calls() - calls))
+    return results
+
+def measure(pages, repeat, api, tmp):
+    """Run every page's scenario ``repeat`` times after a warm-up run.
+
+    Returns:
+        dict: ``{page: {step: {'ms', 'queries', 'api_calls'}}}``, the median
+        time and the most queries and calls of any repetition
+    """
+    import ai_helper
+    import database as db
+
+    path = os.path.join(ROOT, 'app.py')
+    with open(path) as f:
+        code = compile(f.read(), path, 'exec')
+    counts = []
+    counted_connections(db, counts)
+
+    results = {}
+    for page in pages:
+        runs = []
+        for repetition in range(repeat + 1):
+            fresh_state(db, ai_helper, tmp, f'{page}{repetition}')
+            run = run_scenario(page, code, api, counts)
+            # The warm-up run pays for imports and first-time setup
+            if repetition:
+                runs.append(run)
+        results[page] = {
+            step: {
+                'ms': round(statistics.median(run[i][1] for run in runs), 2),
+                'queries': max(run[i][2] for run in runs),
+                'api_calls': max(run[i][3] for run in runs),
+            }
+            for i, (step, _) in enumerate(SCENARIOS[page])
+        }
+    db.close_pool()
+    return results
+
+def compare(result, baseline, tolerance, min_slowdown_ms):
+    """Describe how a step changed from the baseline.
+
+    Returns:
+        tuple: ``(change, regressed)``
+    """
+    if baseline is None:
+        return 'new', False
+    notes, regressed = [], False
+    slower = result['ms'] - baseline['ms']
+    if slower > min_slowdown_ms and result['ms'] > baseline['ms'] * (1 + tolerance):
+        notes.append('slower')
+        regressed = True
+    for counter in ('queries', 'api_calls'):
+        if result[counter] > baseline[counter]:
+            notes.append(f"{counter} {baseline[counter]}->{result[counter]}")
+            regressed = True
+    change = f"{slower:+.2f}ms"
+    return f"{change}  {'REGRESSION: ' + ', '.join(notes) if regressed else ''}", regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', nargs='+', default=PAGES, choices=PAGES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds the fake API waits before answering')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='share of API requests the fake API fails')
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--baseline', default=BASELINE, help='the baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='save the results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='allowed relative slowdown of a step before it is a regression')
+    parser.add_argument('--min-slowdown-ms', type=float, default=2.0,
+                        help='slowdowns smaller than this are never regressions')
+    args = parser.parse_args()
+
+    settings = {'latency': args.latency, 'error_rate': args.error_rate,
+                'error_status': args.error_status}
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        if saved.get('settings') != settings:
+            print(f"Baseline was saved with {saved.get('settings')}, not comparing")
+        else:
+            baseline = saved['pages']
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            FakeOpenAI(args.latency, args.error_rate, args.error_status) as api:
+        os.environ['OPENAI_BASE_URL'] = api.url
+        os.environ.setdefault('OPENAI_API_KEY', 'benchmark')
+        os.chdir(ROOT)  # the app loads assets by relative path
+        results = measure(args.pages, args.repeat, api, tmp)
+
+    regressions = 0
+    print(f"{'page':<10} {'step':<15} {'time':>9} {'queries':>8} {'API calls':>10}  change")
+    for page, page_steps in results.items():
+        for step, result in page_steps.items():
+            change, regressed = compare(result, baseline.get(page, {}).get(step),
+                                        args.tolerance, args.min_slowdown_ms)
+            regressions += regressed
+            if not baseline:
+                change = ''
+            print(f"{page:<10} {step:<15} {result['ms']:>7.2f}ms {result['queries']:>8} "
+                  f"{result['api_calls']:>10}  {change}")
+    print(f"\nAPI requests by prompt: {dict(api.calls)}, failed: {dict(api.errors)}")
+
+    if args.save:
+        saved = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                saved = json.load(f)
+        if saved.get('settings') != settings:
+            saved = {'settings': settings, 'pages': {}}
+        saved['pages'].update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(saved, f, indent=2)
+            f.write('\n')
+        print(f"Saved the baseline to {args.baseline}")
+    elif regressions:
+        print(f"{regressions} step(s) regressed against {args.baseline}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
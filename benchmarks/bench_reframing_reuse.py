@@ -0,0 +1,95 @@
+"""Benchmark reusing past reframings for near-duplicate thoughts.
+
+Fills a temporary journal with reframed thoughts, then looks up paraphrases
+of some of them (words dropped, added, reordered or changed in case) and
+thoughts the journal has nothing like, with
+``ai_helper.find_past_reframing()``. For several similarity thresholds it
+reports how many paraphrases found their original (the API calls a
+reframing page would avoid), how many unrelated thoughts were wrongly
+matched, and the lookup time.
+
+Usage:
+    python benchmarks/bench_reframing_reuse.py [--entries 2000] [--queries 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import ai_helper
+import database as db
+
+SUBJECTS = ['exam', 'presentation', 'roommate', 'professor', 'internship', 'paper', 'interview',
+            'lab report', 'group project', 'quiz', 'midterm', 'application', 'recital', 'shift']
+WORRIES = ['I am going to fail the {}', 'everyone will laugh at me during the {}',
+           'I did not prepare enough for the {}', 'my {} is going to be a disaster',
+           'I will mess up the {} and disappoint everyone', 'the {} proves I am not smart enough']
+FILLERS = ['honestly', 'again', 'tomorrow', 'really', 'probably', 'this week', 'I think']
+
+UNRELATED = ['the weather is nice so I might go for a walk', 'I want to learn to bake bread',
+             'should we adopt a husky next summer', 'my favourite song came on the radio',
+             'planning a trip to Greece with Bean', 'I bought a new bunny plushie']
+
+def paraphrase(thought, rng):
+    """Change a thought the way someone retyping it from memory might."""
+    words = thought.split()
+    edit = rng.choice(['drop', 'add', 'swap', 'case'])
+    if edit == 'drop' and len(words) > 4:
+        del words[rng.randrange(len(words))]
+    elif edit == 'add':
+        words.insert(rng.randrange(len(words) + 1), rng.choice(FILLERS))
+    elif edit == 'swap':
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    else:
+        words = [word.upper() if rng.random() < 0.3 else word for word in words]
+    return ' '.join(words)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.6, 0.7, 0.8, 0.9])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    thoughts = [f"{rng.choice(WORRIES).format(rng.choice(SUBJECTS))} {rng.choice(FILLERS)}"
+                for _ in range(args.entries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close_pool()
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        db.init_db()
+        with db.pooled_connection() as conn:
+            conn.executemany('''
+            INSERT INTO thought_journal (original_thought, reframed_thought, reframing_method)
+            VALUES (?, ?, 'ai-suggested')
+            ''', [(thought, f"Reframing of: {thought}") for thought in thoughts])
+            conn.commit()
+
+        paraphrases = [paraphrase(thought, rng) for thought in rng.sample(thoughts, args.queries)]
+        unrelated = [rng.choice(UNRELATED) for _ in range(args.queries)]
+        ai_helper.find_past_reframing(paraphrases[0])  # vectorize the journal up front
+
+        print(f"{'threshold':>9} {'paraphrases reused':>19} {'unrelated matched':>18} {'lookup':>9}")
+        for threshold in args.thresholds:
+            ai_helper.reuse_stats.clear()
+            started = time.perf_counter()
+            for query in paraphrases:
+                ai_helper.find_past_reframing(query, threshold=threshold)
+            elapsed = time.perf_counter() - started
+            reused = ai_helper.reuse_report()
+            false_hits = sum(ai_helper.find_past_reframing(query, threshold=threshold) is not None
+                             for query in unrelated)
+            print(f"{threshold:>9.2f} {reused['hit_rate']:>18.0%} {false_hits / len(unrelated):>17.0%} "
+                  f"{elapsed / len(paraphrases) * 1000:>7.2f}ms")
+
+        db.close_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark how long one Streamlit rerun of app.py takes on each page.
+
+Runs the app headlessly with ``streamlit.testing.v1.AppTest`` against a
+temporary database and reports the mean and median time it takes to execute
+the script once. Only the script itself is timed, not AppTest's own
+overhead of starting the run and collecting the elements.
+
+Usage:
+    python benchmarks/bench_rerun.py [--reruns 50] [--pages home journal]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from streamlit.testing.v1 import AppTest
+
+import database as db
+
+PAGES = ['home', 'breathing', 'grounding', 'reframing', 'journal']
+
+def timed_script(code, timings):
+    """Run app.py's compiled code as the script, recording how long it took."""
+    import time
+    started = time.perf_counter()
+    try:
+        exec(code, {'__name__': '__main__'})
+    finally:
+        timings.append((time.perf_counter() - started) * 1000)
+
+def time_reruns(page, reruns):
+    """Return the execution time of each rerun of a page in milliseconds."""
+    path = os.path.join(ROOT, 'app.py')
+    with open(path) as f:
+        code = compile(f.read(), path, 'exec')
+    timings = []
+    at = AppTest.from_function(timed_script, args=(code, timings), default_timeout=60)
+    at.session_state.current_page = page
+    at.run()  # the first run pays for imports and database setup
+    for _ in range(reruns):
+        at.run()
+    if at.exception:
+        raise RuntimeError(f"{page} page raised: {at.exception[0].message}")
+    return timings[1:]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reruns', type=int, default=50)
+    parser.add_argument('--pages', nargs='+', default=PAGES, choices=PAGES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close_pool()
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        os.chdir(ROOT)  # the app loads assets by relative path
+
+        print(f"{'page':<10} {'mean':>9} {'median':>9}")
+        for page in args.pages:
+            times = time_reruns(page, args.reruns)
+            print(f"{page:<10} {statistics.mean(times):>7.2f}ms {statistics.median(times):>7.2f}ms")
+
+        db.close_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark recurring-theme detection on a large thought journal.
+
+Fills a temporary journal with entries about a handful of planted topics,
+then times vectorizing the whole journal once, vectorizing a few new entries
+incrementally and clustering all of them with ``themes.find_themes()``, and
+prints the themes found. The target is clustering 100,000 entries in under
+a second on one core.
+
+Usage:
+    python benchmarks/bench_themes.py [--rows 100000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+import themes
+
+TOPICS = [
+    'exam grades study failing class professor test',
+    'friends ignoring texting lonely party invited group',
+    'sleep tired insomnia night awake rest exhausted',
+    'money rent budget afford spending savings bills',
+    'presentation speaking nervous audience slides talk public',
+    'family parents mom dad expectations disappoint home',
+]
+
+FILLER = 'i am so really worried that about my the and it will be'.split()
+
+def populate(conn, rows):
+    """Fill thought_journal with entries about random topics."""
+    rng = random.Random(0)
+
+    def generate():
+        for _ in range(rows):
+            words = rng.sample(rng.choice(TOPICS).split(), 3) + rng.sample(FILLER, 5)
+            rng.shuffle(words)
+            yield (' '.join(words), 'reframed', 'self-guided')
+
+    conn.executemany('''
+    INSERT INTO thought_journal (original_thought, reframed_thought, reframing_method)
+    VALUES (?, ?, ?)
+    ''', generate())
+    conn.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close_pool()
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        db.init_db()
+        with db.pooled_connection() as conn:
+            print(f"Inserting {args.rows:,} rows...")
+            populate(conn, args.rows)
+
+        started = time.perf_counter()
+        vectors = themes.update_vectors()
+        print(f"Vectorizing every entry:  {time.perf_counter() - started:8.3f}s")
+        size = os.path.getsize(themes.vectors_path())
+        print(f"Stored vectors:           {size / 2 ** 20:8.1f}MiB")
+
+        db.save_thought_entry('worried about my exam grades', 'reframed', 'self-guided')
+        started = time.perf_counter()
+        themes.update_vectors()
+        print(f"Adding one entry:         {time.perf_counter() - started:8.3f}s")
+
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            found = themes.find_themes(vectors)
+            timings.append(time.perf_counter() - started)
+        print(f"Clustering every entry:   {min(timings):8.3f}s (best of {args.repeat})\n")
+
+        for theme in found:
+            print(f"{', '.join(theme['terms']):<40} {theme['entries']:>7,} entries "
+                  f"(cohesion {theme['cohesion']:.2f})")
+
+        db.close_pool()
+
+if __name__ == '__main__':
+    main()
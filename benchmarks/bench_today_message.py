@@ -0,0 +1,92 @@
+"""Benchmark the "today's message" lookup on a large daily_messages table.
+
+Compares the old ``WHERE date(created_at) = date(?)`` filter, which forces a
+full table scan, with the half-open range query used by
+``database.get_today_message()``, which is an index seek. The table holds
+messages up to the end of yesterday, i.e. the home page state before today's
+message exists, which is when the old query had to look at every row.
+
+Usage:
+    python benchmarks/bench_today_message.py [--rows 1000000] [--repeat 200]
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+
+OLD_QUERY = '''
+SELECT message
+FROM daily_messages
+WHERE user_id = ? AND date(created_at) = date(?)
+ORDER BY created_at DESC
+LIMIT 1
+'''
+
+NEW_QUERY = '''
+SELECT message
+FROM daily_messages
+WHERE user_id = ? AND created_at >= ? AND created_at < ?
+ORDER BY created_at DESC
+LIMIT 1
+'''
+
+def populate(conn, rows):
+    """Fill daily_messages with one row per minute, ending yesterday."""
+    midnight = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    end = midnight - datetime.timedelta(minutes=1)
+    start = end - datetime.timedelta(minutes=rows - 1)
+
+    def generate():
+        for i in range(rows):
+            created = start + datetime.timedelta(minutes=i)
+            yield (f"message {i}", created.strftime('%Y-%m-%d %H:%M:%S'))
+
+    conn.executemany('INSERT INTO daily_messages (message, created_at) VALUES (?, ?)',
+                     generate())
+    conn.commit()
+
+def time_query(conn, sql, params, repeat):
+    """Return the mean wall time of a query in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(sql, params).fetchone()
+    return (time.perf_counter() - started) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.close_pool()
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        db.init_db()
+
+        with db.pooled_connection() as conn:
+            print(f"Inserting {args.rows:,} rows...")
+            populate(conn, args.rows)
+
+            today = datetime.datetime.now().date()
+            start, end = db.day_bounds(today)
+            cases = [
+                ('date(created_at) = date(?)', OLD_QUERY, (db.DEFAULT_USER_ID, today.isoformat())),
+                ('created_at >= ? AND created_at < ?', NEW_QUERY, (db.DEFAULT_USER_ID, start, end)),
+            ]
+            for label, sql, params in cases:
+                plan = conn.execute('EXPLAIN QUERY PLAN ' + sql, params).fetchall()
+                print(f"\n{label}")
+                for row in plan:
+                    print(f"  plan: {row['detail']}")
+                print(f"  mean: {time_query(conn, sql, params, args.repeat):.3f} ms")
+
+        db.close_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""A local stand-in for the OpenAI chat completions API.
+
+Answers ``POST /v1/chat/completions``, streamed or not, with a fixed reply
+after a configurable delay, and fails a configurable share of requests with
+an HTTP error so the retry and fallback paths can be exercised. Every
+request is counted by the prompt template that made it. Point the app at it
+with ``OPENAI_BASE_URL``:
+
+    python benchmarks/fake_openai.py --port 8765 --latency 0.2 --error-rate 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake streamlit run app.py
+
+Benchmarks start it in-process instead, see ``FakeOpenAI``.
+"""
+import argparse
+import collections
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = "You are doing so much better than you think, Boopie. I am proud of you. ❤️"
+
+USAGE = {'prompt_tokens': 250, 'completion_tokens': 20, 'total_tokens': 270}
+
+# Prompt templates, told apart by the start of their user message
+TEMPLATES = {
+    'Provide a kind, thoughtful reframing': 'reframing',
+    'Provide personalized advice': 'advice',
+    'Create a single personalized affirmation': 'affirmation',
+}
+
+class FakeOpenAI:
+    """An OpenAI-compatible server running on a background thread.
+
+    Use it as a context manager; ``url`` is the base URL to give the client.
+
+    Args:
+        latency (float): Seconds to wait before answering each request
+        error_rate (float): Share of requests answered with ``error_status``
+        error_status (int): The HTTP status of failed requests
+        seed (int): Seeds which requests fail, so runs are repeatable
+        port (int): The port to listen on, 0 for any free one
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, error_status=500, seed=0, port=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.calls = collections.Counter()
+        self.errors = collections.Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def serve_forever(self):
+        """Answer requests on this thread until ``stop()`` is called."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        """Answer requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def total_calls(self):
+        """Return how many requests have been received, failed ones included."""
+        with self._lock:
+            return sum(self.calls.values())
+
+    def _record(self, body):
+        """Count a request and decide whether it fails."""
+        user = next((m['content'] for m in body.get('messages', []) if m.get('role') == 'user'), '')
+        template = next((name for prefix, name in TEMPLATES.items() if user.startswith(prefix)),
+                        'other')
+        with self._lock:
+            self.calls[template] += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors[template] += 1
+        return failed
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if not self.path.endswith('/chat/completions'):
+                    return self._json(404, {'error': {'message': f"Unknown path {self.path}"}})
+                failed = fake._record(body)
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if failed:
+                    return self._json(fake.error_status, {'error': {
+                        'message': 'Injected failure', 'type': 'server_error', 'code': None}})
+                if body.get('stream'):
+                    return self._stream(body)
+                self._json(200, {
+                    'id': 'chatcmpl-fake', 'object': 'chat.completion', 'created': int(time.time()),
+                    'model': body.get('model', 'gpt-4o'),
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': REPLY}}],
+                    'usage': USAGE,
+                })
+
+            def _json(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, body):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                chunk = {'id': 'chatcmpl-fake', 'object': 'chat.completion.chunk',
+                         'created': int(time.time()), 'model': body.get('model', 'gpt-4o')}
+                for word in REPLY.split(' '):
+                    delta = {'content': word + ' '}
+                    self._event(dict(chunk, choices=[{'index': 0, 'delta': delta,
+                                                      'finish_reason': None}]))
+                if body.get('stream_options', {}).get('include_usage'):
+                    self._event(dict(chunk, choices=[], usage=USAGE))
+                self.wfile.write(b'data: [DONE]\n\n')
+                self.close_connection = True
+
+            def _event(self, payload):
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds to wait before answering each request')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='share of requests to fail')
+    parser.add_argument('--error-status', type=int, default=500,
+                        help='HTTP status of failed requests, e.g. 429 or 500')
+    args = parser.parse_args()
+
+    server = FakeOpenAI(args.latency, args.error_rate, args.error_status, port=args.port)
+    print(f"Serving a fake OpenAI API at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"Requests: {dict(server.calls)}, failed: {dict(server.errors)}")
+
+if __name__ == '__main__':
+    main()
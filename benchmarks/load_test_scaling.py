@@ -0,0 +1,82 @@
+"""Load test the storage backend with an increasing number of app processes.
+
+Each worker process stands in for one app instance: it opens its own
+connection pool and runs a mix of the database calls a journal session makes
+(save an entry, read the first journal page, read today's message) as fast
+as it can. The total throughput is reported for 1, 2, 4 and 8 processes, so
+a shared backend that scales horizontally shows ops/sec growing with the
+process count.
+
+Point it at PostgreSQL with DATABASE_URL, or leave it unset to load a
+temporary SQLite file (which every process then has to share):
+
+    DATABASE_URL=postgresql://localhost/soulsoother \\
+        python benchmarks/load_test_scaling.py [--processes 1 2 4 8] [--seconds 5]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db
+
+def worker(db_path, worker_id, seconds, start_at, results):
+    """Run the operation mix until the time is up and report the op count."""
+    db.DB_PATH = db_path
+    user_id = f'load-test-{worker_id % 4}'
+    db.init_db()
+
+    # Start together so the processes actually overlap
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = time.monotonic() + seconds
+    ops = 0
+    while time.monotonic() < deadline:
+        db.save_thought_entry("load test thought", "load test reframing", "cbt", user_id)
+        db.get_thought_entries_page(db.JOURNAL_PAGE_SIZE, user_id=user_id)
+        db.get_today_message(user_id)
+        ops += 3
+    db.close_pool()
+    results.put(ops)
+
+def run(db_path, processes, seconds):
+    """Return the total ops/sec of ``processes`` concurrent workers."""
+    results = multiprocessing.Queue()
+    start_at = time.time() + 1.0
+    workers = [multiprocessing.Process(target=worker, args=(db_path, i, seconds, start_at, results))
+               for i in range(processes)]
+    for process in workers:
+        process.start()
+    total = sum(results.get() for _ in workers)
+    for process in workers:
+        process.join()
+    return total / seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    url = os.environ.get(db.DATABASE_URL_ENV)
+    print(f"Backend: {'PostgreSQL' if url else 'SQLite'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'load_test.db')
+        # Create the schema once so the workers don't all migrate at startup
+        db.DB_PATH = db_path
+        db.init_db()
+        db.close_pool()
+
+        baseline = None
+        print(f"{'processes':>9}  {'ops/sec':>10}  {'speedup':>7}")
+        for processes in args.processes:
+            throughput = run(db_path, processes, args.seconds)
+            baseline = baseline or throughput
+            print(f"{processes:>9}  {throughput:>10,.0f}  {throughput / baseline:>6.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import datetime
+import threading
+import database as db
+from ai_helper import agenerate_custom_affirmation, run_async
+
+logger = logging.getLogger(__name__)
+
+# Background pre-generation of the home page's daily message.
+#
+# Messages for the next few days are generated ahead of time, a batch of
+# concurrent requests at a time, so that the home page only ever reads
+# today's message from the database and never waits on the AI. Run it once
+# from the command line (e.g. from cron):
+#
+#     python daily_messages.py --days 7
+#
+# or start the scheduler thread inside the app by setting the
+# PREGENERATE_DAILY_MESSAGES environment variable. The scheduler fills
+# messages for every user with saved preferences (see db.get_user_ids());
+# other users get theirs generated when they first open the home page.
+DEFAULT_DAYS_AHEAD = int(os.environ.get("DAILY_MESSAGE_DAYS_AHEAD", 7))
+DEFAULT_BATCH_SIZE = 4
+DEFAULT_INTERVAL_SECONDS = 6 * 60 * 60
+
+def get_missing_days(days=DEFAULT_DAYS_AHEAD, start=None, user_id=db.DEFAULT_USER_ID):
+    """Get the upcoming days that do not have a daily message yet.
+
+    Args:
+        days (int): How many days to look ahead, today included
+        start (datetime.date): First day to check, defaults to today
+        user_id (str): The user to check
+
+    Returns:
+        list: The ``datetime.date`` of every day without a message, in order
+    """
+    start = start or datetime.date.today()
+    end = start + datetime.timedelta(days=days)
+    existing = db.get_daily_message_days(start, end, user_id)
+    return [start + datetime.timedelta(days=i) for i in range(days)
+            if start + datetime.timedelta(days=i) not in existing]
+
+async def _generate_batch(batch, user_id):
+    """Generate one affirmation per day in the batch for a user, concurrently."""
+    results = await asyncio.gather(
+        *(agenerate_custom_affirmation(for_date=day, fallback=False, user_id=user_id)
+          for day in batch),
+        return_exceptions=True
+    )
+    messages = []
+    for day, result in zip(batch, results):
+        # A cancelled generation comes back as a CancelledError, which is
+        # not an Exception
+        if isinstance(result, BaseException):
+            # Leave the day empty; the next run or the home page will fill it
+            logger.warning("Could not generate the message for %s: %s", day, result)
+        else:
+            messages.append((result, day))
+    return messages
+
+def pregenerate_daily_messages(days=DEFAULT_DAYS_AHEAD, batch_size=DEFAULT_BATCH_SIZE, start=None,
+                               user_id=db.DEFAULT_USER_ID):
+    """Fill in daily messages for the upcoming days that do not have one.
+
+    Args:
+        days (int): How many days to look ahead, today included
+        batch_size (int): How many messages to generate and save at once
+        start (datetime.date): First day to fill, defaults to today
+        user_id (str): The user to generate messages for
+
+    Returns:
+        int: The number of messages saved
+    """
+    missing = get_missing_days(days, start, user_id)
+    saved = 0
+    for i in range(0, len(missing), batch_size):
+        messages = run_async(_generate_batch(missing[i:i + batch_size], user_id))
+        if messages:
+            saved += db.save_daily_messages(messages, user_id)
+    logger.info("Pre-generated %d of %d missing daily messages", saved, len(missing))
+    return saved
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def start_scheduler(days=DEFAULT_DAYS_AHEAD, interval_seconds=DEFAULT_INTERVAL_SECONDS):
+    """Start a background thread that keeps every user's upcoming messages filled in.
+
+    Only one scheduler runs per process; calling this again returns the
+    thread that is already running.
+
+    Args:
+        days (int): How many days to keep filled, today included
+        interval_seconds (float): Time between runs
+
+    Returns:
+        threading.Thread: The scheduler thread
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = threading.Thread(target=_run_scheduler, args=(days, interval_seconds),
+                                          name="daily-message-scheduler", daemon=True)
+            _scheduler.start()
+        return _scheduler
+
+def _run_scheduler(days, interval_seconds):
+    while True:
+        try:
+            for user_id in db.get_user_ids():
+                pregenerate_daily_messages(days, user_id=user_id)
+        except Exception:
+            logger.exception("Daily message pre-generation failed")
+        time.sleep(interval_seconds)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate upcoming daily messages.")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS_AHEAD,
+                        help="how many days to fill, today included")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="how many messages to generate concurrently")
+    parser.add_argument("--user", default=db.DEFAULT_USER_ID,
+                        help="the user to generate messages for")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    saved = pregenerate_daily_messages(args.days, args.batch_size, user_id=args.user)
+    print(f"Saved {saved} daily message(s).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+import base64
+import functools
+
+# Static HTML and CSS for app.py.
+#
+# Streamlit re-executes app.py from the top on every interaction, but this
+# module is imported once per process. Fragments that never change are built
+# here once as constants, and the few that depend on a value are rendered by
+# memoized functions, so a rerun only formats what actually changed.
+
+# Page title (compatible with older Streamlit versions)
+PAGE_TITLE = "<h1 style='text-align: center'>Boopie's Calm Space 🧠</h1>"
+
+# Custom CSS for aesthetics
+CUSTOM_CSS = """
+<style>
+    .block-container {
+        padding-top: 2rem;
+    }
+    
+    h1, h2, h3 {
+        font-family: 'Georgia', serif;
+        letter-spacing: 0.5px;
+    }
+    
+    h1 {
+        color: #FF4B8B;
+        border-bottom: 2px solid #FFD1E0;
+        padding-bottom: 10px;
+    }
+    
+    h2 {
+        color: #FF6B9D;
+    }
+    
+    h3 {
+        color: #FF8BAD;
+    }
+    
+    .stButton>button {
+        border-radius: 20px;
+        border: 1px solid #FF6B9D;
+        transition: all 0.3s ease;
+    }
+    
+    .stButton>button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 4px 8px rgba(255, 107, 157, 0.2);
+    }
+    
+    .stTextInput>div>div>input, .stTextArea>div>div>textarea {
+        border-radius: 10px;
+        border: 1px solid #FFD1E0;
+    }
+    
+    .stTextInput>div>div>input:focus, .stTextArea>div>div>textarea:focus {
+        border: 1px solid #FF6B9D;
+        box-shadow: 0 0 5px rgba(255, 107, 157, 0.3);
+    }
+    
+    .stProgress>div>div>div>div {
+        background-color: #FF6B9D;
+    }
+    
+    .stAlert {
+        border-radius: 10px;
+    }
+    
+    .stExpander {
+        border-radius: 10px;
+        border: 1px solid #FFD1E0;
+    }
+    
+    div.stTabs [data-baseweb="tab-list"] {
+        gap: 2px;
+    }
+    
+    div.stTabs [data-baseweb="tab"] {
+        border-radius: 5px 5px 0px 0px;
+        padding: 10px 20px;
+        background-color: #FFE6EF;
+    }
+    
+    div.stTabs [aria-selected="true"] {
+        background-color: #FF6B9D;
+        color: white;
+    }
+</style>
+"""
+
+# Sidebar logo
+SIDEBAR_LOGO_PATH = "assets/calm.svg"
+
+# Sidebar header
+SIDEBAR_HEADER = """
+<div style="text-align: center; margin-bottom: 20px;">
+    <h2 style="color: #FF4B8B; margin-bottom: 0;">Hey Boopie! 💕</h2>
+    <p style="font-style: italic; color: #9D6381;">Tools for when your mind races</p>
+</div>
+"""
+
+# Subtle spacing between the header and the navigation buttons
+SIDEBAR_SPACER = '<div style="height: 10px;"></div>'
+
+# Decorative divider between sidebar sections
+SIDEBAR_DIVIDER = """
+<div style="margin: 20px 0; text-align: center;">
+    <div style="height: 2px; background-image: linear-gradient(to right, transparent, #FFB0EE, transparent);"></div>
+</div>
+"""
+
+# Song recommendation card
+SONG_CARD = """
+<div style="text-align: center; background-color: #FFF0F7; border-radius: 10px; padding: 10px; margin: 10px 0;">
+    <div style="font-weight: bold; color: #FF6B9D;">When you need a smile 🎵</div>
+    <div style="font-size: 0.9em; margin-top: 5px;">Listen to 'ilym' by John K</div>
+    <div style="font-style: italic; font-size: 0.8em;">Or check out our 'Happy Baby' playlist 🎧</div>
+</div>
+"""
+
+# Navigation pages as (route, button name, icon)
+NAV_ITEMS = (
+    ('home', 'Home', '🏠'),
+    ('breathing', 'Breathing Exercise', '🌬️'),
+    ('grounding', 'Grounding Exercise', '🌿'),
+    ('reframing', 'Thought Reframing', '💭'),
+    ('journal', 'Thought Journal', '📓'),
+)
+
+# Home page header with gradient
+HOME_HEADER = """
+    <div style="text-align: center; margin-bottom: 1.5rem;">
+        <h1 style="color: #FF4B8B; margin-bottom: 0.5rem; font-size: 2.5rem;">
+            Hey Hiya! Your Calm Space Awaits 💖
+        </h1>
+        <div style="height: 4px; background-image: linear-gradient(to right, transparent, #FF6B9D, transparent);
+                    margin: 0 auto 1rem auto; width: 70%;"></div>
+    </div>
+    """
+
+# Home page welcome card
+WELCOME_CARD = """
+    <div style="background-color: #FFF0F7; border-radius: 15px; padding: 20px; margin-bottom: 2rem; 
+                border-left: 5px solid #FF6B9D; box-shadow: 0 4px 6px rgba(255, 107, 157, 0.1);">
+        <h3 style="color: #FF4B8B; margin-top: 0;">From Bean to Boopie with love</h3>
+        <p style="margin-bottom: 1rem;">
+            This is a special space just for you, for those moments when your beautiful mind 
+            is racing too fast. Whether you're in your studio in West Lafayette or anywhere else,
+            I'm here with you in spirit.
+        </p>
+        <p style="font-weight: bold; color: #FF6B9D; font-size: 1.1rem;">
+            How's my Boopie feeling right now?
+        </p>
+    </div>
+    """
+
+# Mood options on the home page
+MOOD_OPTIONS = (
+    {"title": "Anxious or worried", "icon": "😰", "color": "#8AADF4", "route": "breathing"},
+    {"title": "Stuck in my thoughts", "icon": "🤔", "color": "#A6DA95", "route": "grounding"},
+    {"title": "Need perspective", "icon": "🧐", "color": "#F5BDE6", "route": "reframing"},
+)
+
+# Opening tag of a row of mood cards or buttons
+MOOD_ROW_OPEN = '<div style="display: flex; justify-content: space-between; margin-bottom: 20px;">'
+
+def _mood_card(option):
+    return f'''
+        <div style="flex: 1; text-align: center; margin: 0 5px;">
+            <div style="font-size: 2rem; margin-bottom: 0.5rem;">{option['icon']}</div>
+            <div style="background-color: {option['color']}; color: white; padding: 10px; 
+                      border-radius: 10px; font-weight: bold;">
+                {option['title']}
+            </div>
+        </div>
+        '''
+
+# All mood cards in a single row
+MOOD_CARDS = MOOD_ROW_OPEN + ''.join(_mood_card(option) for option in MOOD_OPTIONS) + '</div>'
+
+# Closing tag for the row and centering wrappers
+CLOSE_DIV = '</div>'
+
+# Styled divider between home page sections
+HOME_DIVIDER = """
+    <div style="margin: 2rem 0; text-align: center;">
+        <div style="height: 2px; background-image: linear-gradient(to right, transparent, #FFB0EE, #FF6B9D, #FFB0EE, transparent);"></div>
+    </div>
+    """
+
+# Header above today's message
+DAILY_MESSAGE_HEADER = """
+    <div style="margin-bottom: 1rem;">
+        <h3 style="color: #FF4B8B; display: inline-block; margin-right: 10px;">Today's Message from Bean</h3>
+        <span style="font-size: 1.5rem;">💌</span>
+    </div>
+    """
+
+# Creative activity suggestion card
+COLORING_CARD = """
+    <div style="background-color: #FFF8E1; border-radius: 15px; padding: 20px; margin: 1.5rem 0;
+                border-left: 5px solid #FFD54F; box-shadow: 0 4px 6px rgba(255, 213, 79, 0.1);">
+        <h3 style="color: #E6A800; margin-top: 0;">Maybe some coloring would help? 🎨</h3>
+        <p style="margin: 0;">
+            I know how much you enjoy drawing and coloring when your mind is busy. 
+            Maybe take out your art supplies for a bit?
+        </p>
+    </div>
+    """
+
+# Reminders card
+REMINDERS_CARD = """
+    <div style="background-color: #F0F4FF; border-radius: 15px; padding: 20px; margin-bottom: 1.5rem;
+                border-left: 5px solid #8BB6FF; box-shadow: 0 4px 6px rgba(139, 182, 255, 0.1);">
+        <h3 style="color: #4B77CC; margin-top: 0;">Just a few reminders from your Bean:</h3>
+        <ul style="padding-left: 20px; margin-bottom: 0;">
+            <li>Your thoughts are just thoughts, not reality - like how Penn State is clearly superior to Purdue 😉</li>
+            <li>This moment will pass, just like our debates about you eating enough</li>
+            <li>You're amazing at working through challenges (except spelling "Porsche" correctly 😘)</li>
+            <li>When in doubt, hug Daisy the bunny tight!</li>
+        </ul>
+        <p style="margin-top: 15px; color: #4B77CC;">
+            Remember our Paris dream? Balcony, bathrobes, wine, Eiffel Tower view? 
+            Keep breathing, we'll get there someday. 🗼✨
+        </p>
+    </div>
+    """
+
+# Header above the advice button
+ADVICE_HEADER = """
+    <div style="text-align: center; margin: 2rem 0 1rem 0;">
+        <h3 style="color: #FF4B8B; margin-bottom: 1rem;">Need Bean's advice right now?</h3>
+    </div>
+    """
+
+# Opening tag of a centered row
+CENTERED_ROW_OPEN = '<div style="display: flex; justify-content: center;">'
+
+
+@functools.lru_cache(maxsize=None)
+def sidebar_logo():
+    """Return the sidebar logo as a data URI, read from disk only once."""
+    with open(SIDEBAR_LOGO_PATH, encoding="utf-8") as f:
+        svg = f.read()
+    return "data:image/svg+xml;base64," + base64.b64encode(svg.encode("utf-8")).decode("ascii")
+
+@functools.lru_cache(maxsize=len(NAV_ITEMS))
+def active_nav_item(icon, name):
+    """Render the highlighted sidebar entry of the current page."""
+    return f"""
+        <div style="background-color: #FFC6D9; border-radius: 15px; padding: 10px; text-align: center; margin: 5px 0;">
+            <span style="color: #FF4B8B; font-weight: bold;">{icon} {name}</span>
+        </div>
+        """
+
+@functools.lru_cache(maxsize=8)
+def days_together_card(days_together):
+    """Render the sidebar card counting the days together."""
+    return f"""
+<div style="text-align: center; background-color: #FFF0F7; border-radius: 10px; padding: 10px; margin: 10px 0;">
+    <div style="font-weight: bold; color: #FF6B9D;">Bean & Boopie</div>
+    <div style="font-style: italic; font-size: 0.9em;">{days_together} days of adventures together 💫</div>
+</div>
+"""
+
+@functools.lru_cache(maxsize=64)
+def affirmation_card(affirmation):
+    """Render the sidebar affirmation."""
+    return f"""
+<div style="font-style: italic; text-align: center; color: #FF8BAD; padding: 10px; border-radius: 10px; background-color: #FFF8FA;">
+    "{affirmation}"
+</div>
+"""
+
+@functools.lru_cache(maxsize=64)
+def today_message_card(today_message):
+    """Render the card with today's message on the home page."""
+    return f"""
+        <div style="background-color: #E7F5EB; border-radius: 15px; padding: 20px; margin-bottom: 1.5rem;
+                    border-left: 5px solid #8BC0A8; box-shadow: 0 4px 6px rgba(139, 192, 168, 0.1);">
+            <p style="font-style: italic; color: #2D7D53; margin: 0; font-size: 1.1rem;">"{today_message}"</p>
+        </div>
+        """
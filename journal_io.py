@@ -0,0 +1,231 @@
+import io
+import os
+import sys
+import csv
+import json
+import argparse
+import datetime
+import database as db
+
+# Backup and restore of a user's thought journal and daily messages.
+#
+# Exports are written as they are read: rows stream out of the database a
+# batch at a time and every row is formatted and written before the next
+# one is fetched, so memory use stays flat however long the journal is.
+# Imports read the file the same way and add the rows a chunk at a time,
+# all in one transaction, so a malformed row leaves nothing half imported.
+# Two formats are supported:
+#
+# * JSONL: one JSON object per line, with a "table" key naming where the
+#   row belongs
+# * CSV: one row per line with the union of both tables' columns, the
+#   "table" column naming where the row belongs
+#
+# Row IDs and the user are not exported, so a backup can be restored for
+# any user, on either storage backend. Restoring appends to what the user
+# already has. From the command line:
+#
+#     python journal_io.py export backup.jsonl --user default
+#     python journal_io.py import backup.jsonl --user default
+
+FORMATS = ('jsonl', 'csv')
+
+# Rows inserted at a time when importing
+IMPORT_CHUNK_SIZE = 10_000
+
+# Columns of each table, in export order
+COLUMNS = db.IMPORT_COLUMNS
+
+CSV_FIELDS = ('table', 'created_at', 'original_thought', 'reframed_thought', 'reframing_method',
+              'message')
+
+MIME_TYPES = {'jsonl': 'application/x-ndjson', 'csv': 'text/csv'}
+
+def iter_rows(user_id=db.DEFAULT_USER_ID):
+    """Stream every journal entry and daily message of a user.
+
+    Yields:
+        tuple: ``(table, row)``, ``row`` mapping the table's ``COLUMNS`` to
+        their values
+    """
+    for entry in db.stream_thought_entries(user_id):
+        yield 'thought_journal', {
+            'original_thought': entry['original'],
+            'reframed_thought': entry['reframed'],
+            'reframing_method': entry['method'],
+            'created_at': entry['created_at'],
+        }
+    for message in db.stream_daily_messages(user_id):
+        yield 'daily_messages', message
+
+def iter_export(format, user_id=db.DEFAULT_USER_ID):
+    """Stream a user's backup as text, one line at a time.
+
+    Args:
+        format (str): ``'jsonl'`` or ``'csv'``
+        user_id (str): The user to back up
+
+    Yields:
+        str: The next line of the backup, newline included
+    """
+    if format == 'jsonl':
+        for table, row in iter_rows(user_id):
+            yield json.dumps({'table': table, **row}, ensure_ascii=False) + '\n'
+        return
+    if format != 'csv':
+        raise ValueError(f"Unknown backup format {format!r}, expected one of {FORMATS}")
+
+    # The csv module only writes to files, so each line goes through a buffer
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, CSV_FIELDS, lineterminator='\n')
+    writer.writeheader()
+    for table, row in iter_rows(user_id):
+        writer.writerow({'table': table, **row})
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def export(file, format, user_id=db.DEFAULT_USER_ID):
+    """Write a user's backup to an open text file.
+
+    Args:
+        file: A file opened for writing text
+        format (str): ``'jsonl'`` or ``'csv'``
+        user_id (str): The user to back up
+    """
+    for line in iter_export(format, user_id):
+        file.write(line)
+
+def export_bytes(format, user_id=db.DEFAULT_USER_ID):
+    """Return a user's whole backup as UTF-8 bytes, e.g. for a download."""
+    buffer = io.BytesIO()
+    for line in iter_export(format, user_id):
+        buffer.write(line.encode('utf-8'))
+    return buffer.getvalue()
+
+def _parse(file, format):
+    """Yield ``(line number, row)`` for every row of a backup file."""
+    if format == 'jsonl':
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"line {number}: not valid JSON ({e.msg})") from None
+            yield number, row
+    elif format == 'csv':
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        raise ValueError(f"Unknown backup format {format!r}, expected one of {FORMATS}")
+
+def _timestamp(value, number):
+    """Normalise a restored created_at to the stored 'YYYY-MM-DD HH:MM:SS' form."""
+    try:
+        created = datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"line {number}: bad created_at {value!r}") from None
+    if created.tzinfo is not None:
+        created = created.astimezone(datetime.timezone.utc)
+    return created.strftime('%Y-%m-%d %H:%M:%S')
+
+def _values(number, row):
+    """Check one parsed row and return its table and column values.
+
+    Raises:
+        ValueError: Naming the line, if the row is not an object with a
+        known table and a string for every one of the table's columns
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"line {number}: expected an object, got {type(row).__name__}")
+    table = row.get('table')
+    if table not in COLUMNS:
+        raise ValueError(f"line {number}: unknown table {table!r}")
+    columns = COLUMNS[table]
+    for column in columns:
+        if row.get(column) is None:
+            raise ValueError(f"line {number}: missing {column!r}")
+        if not isinstance(row[column], str):
+            raise ValueError(f"line {number}: {column!r} must be a string")
+    values = tuple(row[column] for column in columns[:-1])
+    return table, values + (_timestamp(row[columns[-1]], number),)
+
+def _chunks(file, format, chunk_size):
+    """Yield ``(table, rows)`` chunks of checked rows from a backup file."""
+    chunks = {table: [] for table in COLUMNS}
+    for number, row in _parse(file, format):
+        table, values = _values(number, row)
+        chunk = chunks[table]
+        chunk.append(values)
+        if len(chunk) >= chunk_size:
+            yield table, chunk
+            chunks[table] = []
+    for table, chunk in chunks.items():
+        if chunk:
+            yield table, chunk
+
+def restore(file, format, user_id=db.DEFAULT_USER_ID, chunk_size=IMPORT_CHUNK_SIZE):
+    """Add the rows of a backup to a user's journal and daily messages.
+
+    The file is read and inserted ``chunk_size`` rows at a time, all in one
+    transaction: if any row is malformed, nothing is imported.
+
+    Args:
+        file: A backup file opened for reading text
+        format (str): ``'jsonl'`` or ``'csv'``
+        user_id (str): The user to restore the rows for
+        chunk_size (int): Rows inserted at a time
+
+    Returns:
+        dict: The number of rows added to each table
+
+    Raises:
+        ValueError: Naming the line of the first malformed row
+    """
+    return db.import_rows(_chunks(file, format, chunk_size), user_id)
+
+def _format_of(path, format):
+    if format:
+        return format
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+    return 'jsonl' if extension in ('json', 'ndjson') else extension
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Back up or restore a user's journal and daily messages.")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="the backup file; - for standard output/input")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="the backup format, by default taken from the file extension")
+    parser.add_argument("--user", default=db.DEFAULT_USER_ID,
+                        help="the user to back up or restore")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE,
+                        help="rows inserted at a time when importing")
+    args = parser.parse_args(argv)
+
+    format = _format_of(args.path, args.format)
+    if format not in FORMATS:
+        parser.error("cannot tell the format from the file name, use --format")
+
+    if args.command == "export":
+        if args.path == "-":
+            export(sys.stdout, format, args.user)
+        else:
+            with open(args.path, "w", encoding="utf-8", newline="") as f:
+                export(f, format, args.user)
+        return 0
+
+    if args.path == "-":
+        added = restore(sys.stdin, format, args.user, args.chunk_size)
+    else:
+        with open(args.path, encoding="utf-8", newline="") as f:
+            added = restore(f, format, args.user, args.chunk_size)
+    print(f"Imported {added['thought_journal']} journal entries and "
+          f"{added['daily_messages']} daily messages.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,531 @@
+import datetime
+
+# Owner of every row written before tables were partitioned by user
+DEFAULT_USER_ID = 'default'
+
+# Schema migrations for the SQLite and PostgreSQL backends.
+#
+# Each migration is a function that takes a connection and brings the schema
+# from version ``n - 1`` to ``n``. SQLite stores the version in
+# ``PRAGMA user_version``, PostgreSQL in the schema_version table. Add new
+# migrations to the end of ``MIGRATIONS`` (and ``POSTGRES_MIGRATIONS``);
+# never edit or reorder ones that have already shipped.
+
+def _create_tables(conn):
+    """Version 1: the original tables and the default user preferences."""
+    # IF NOT EXISTS so databases created before versioning upgrade cleanly
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS thought_journal (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        original_thought TEXT NOT NULL,
+        reframed_thought TEXT NOT NULL,
+        reframing_method TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS daily_messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        message TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS user_preferences (
+        id INTEGER PRIMARY KEY,
+        nickname TEXT DEFAULT 'Boopie',
+        last_login TIMESTAMP
+    )
+    ''')
+
+    conn.execute('''
+    INSERT OR IGNORE INTO user_preferences (id, nickname, last_login)
+    VALUES (1, 'Boopie', ?)
+    ''', (datetime.datetime.now().isoformat(sep=' '),))
+
+def _index_created_at(conn):
+    """Version 2: index the timestamp columns used for date lookups."""
+    conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_daily_messages_created_at
+    ON daily_messages (created_at)
+    ''')
+
+    conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_thought_journal_created_at
+    ON thought_journal (created_at)
+    ''')
+
+def _create_ai_response_cache(conn):
+    """Version 3: persistent tier of the AI response cache."""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS ai_response_cache (
+        cache_key TEXT PRIMARY KEY,
+        response TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    ''')
+
+    conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_ai_response_cache_created_at
+    ON ai_response_cache (created_at)
+    ''')
+
+def _partition_by_user(conn):
+    """Version 4: give every table a user key and index by (user_id, created_at)."""
+    for table in ('thought_journal', 'daily_messages'):
+        conn.execute(f'''
+        ALTER TABLE {table}
+        ADD COLUMN user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER_ID}'
+        ''')
+
+    # Per-user lookups are served by the composite indexes instead
+    conn.execute('DROP INDEX IF EXISTS idx_daily_messages_created_at')
+    conn.execute('DROP INDEX IF EXISTS idx_thought_journal_created_at')
+
+    conn.execute('''
+    CREATE INDEX idx_daily_messages_user_created_at
+    ON daily_messages (user_id, created_at)
+    ''')
+
+    conn.execute('''
+    CREATE INDEX idx_thought_journal_user_created_at
+    ON thought_journal (user_id, created_at)
+    ''')
+
+    # user_preferences was a single row with id = 1; key it by user instead
+    conn.execute('''
+    CREATE TABLE user_preferences_by_user (
+        user_id TEXT PRIMARY KEY,
+        nickname TEXT DEFAULT 'Boopie',
+        last_login TIMESTAMP
+    )
+    ''')
+
+    conn.execute('''
+    INSERT INTO user_preferences_by_user (user_id, nickname, last_login)
+    SELECT ?, nickname, last_login FROM user_preferences WHERE id = 1
+    ''', (DEFAULT_USER_ID,))
+
+    conn.execute('DROP TABLE user_preferences')
+    conn.execute('ALTER TABLE user_preferences_by_user RENAME TO user_preferences')
+
+def _create_journal_search(conn):
+    """Version 5: full-text index over journal entries, kept in sync by triggers."""
+    # External content table: the text lives only in thought_journal and the
+    # FTS table stores just the index, keyed by thought_journal.id. Searches
+    # match word prefixes, so words are not stemmed, and short prefixes get
+    # their own index.
+    conn.execute('''
+    CREATE VIRTUAL TABLE thought_journal_fts USING fts5(
+        original_thought,
+        reframed_thought,
+        content='thought_journal',
+        content_rowid='id',
+        prefix='2 3'
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER thought_journal_fts_insert AFTER INSERT ON thought_journal BEGIN
+        INSERT INTO thought_journal_fts (rowid, original_thought, reframed_thought)
+        VALUES (new.id, new.original_thought, new.reframed_thought);
+    END
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER thought_journal_fts_delete AFTER DELETE ON thought_journal BEGIN
+        INSERT INTO thought_journal_fts (thought_journal_fts, rowid, original_thought, reframed_thought)
+        VALUES ('delete', old.id, old.original_thought, old.reframed_thought);
+    END
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER thought_journal_fts_update
+    AFTER UPDATE OF original_thought, reframed_thought ON thought_journal BEGIN
+        INSERT INTO thought_journal_fts (thought_journal_fts, rowid, original_thought, reframed_thought)
+        VALUES ('delete', old.id, old.original_thought, old.reframed_thought);
+        INSERT INTO thought_journal_fts (rowid, original_thought, reframed_thought)
+        VALUES (new.id, new.original_thought, new.reframed_thought);
+    END
+    ''')
+
+    # Index the entries written before the triggers existed
+    conn.execute("INSERT INTO thought_journal_fts (thought_journal_fts) VALUES ('rebuild')")
+
+# Journal rollups: per-user counts of journal entries per day and per week
+# (starting on Monday), split by reframing method, so journal statistics
+# read one row per period instead of every entry. Periods are taken from
+# the UTC created_at text.
+
+def _create_journal_rollups(conn):
+    """Version 6: journal_rollups, kept up to date by triggers and backfilled."""
+    conn.execute('''
+    CREATE TABLE journal_rollups (
+        user_id TEXT NOT NULL,
+        period TEXT NOT NULL,
+        period_start TEXT NOT NULL,
+        reframing_method TEXT NOT NULL,
+        entries INTEGER NOT NULL,
+        PRIMARY KEY (user_id, period, period_start, reframing_method)
+    ) WITHOUT ROWID
+    ''')
+
+    # Each entry counts once towards its day and once towards its week
+    add = '''
+        INSERT INTO journal_rollups (user_id, period, period_start, reframing_method, entries)
+        VALUES (new.user_id, 'day', substr(new.created_at, 1, 10), new.reframing_method, 1),
+               (new.user_id, 'week', date(new.created_at, 'weekday 0', '-6 days'),
+                new.reframing_method, 1)
+        ON CONFLICT (user_id, period, period_start, reframing_method)
+        DO UPDATE SET entries = entries + 1;
+    '''
+    remove = '''
+        UPDATE journal_rollups SET entries = entries - 1
+        WHERE user_id = old.user_id AND reframing_method = old.reframing_method
+          AND ((period = 'day' AND period_start = substr(old.created_at, 1, 10))
+            OR (period = 'week' AND period_start = date(old.created_at, 'weekday 0', '-6 days')));
+        DELETE FROM journal_rollups WHERE user_id = old.user_id AND entries <= 0;
+    '''
+
+    conn.execute(f'''
+    CREATE TRIGGER thought_journal_rollups_insert AFTER INSERT ON thought_journal BEGIN
+        {add}
+    END
+    ''')
+
+    conn.execute(f'''
+    CREATE TRIGGER thought_journal_rollups_delete AFTER DELETE ON thought_journal BEGIN
+        {remove}
+    END
+    ''')
+
+    conn.execute(f'''
+    CREATE TRIGGER thought_journal_rollups_update
+    AFTER UPDATE OF user_id, reframing_method, created_at ON thought_journal BEGIN
+        {remove}
+        {add}
+    END
+    ''')
+
+    # Count the entries written before the triggers existed
+    conn.execute('''
+    INSERT INTO journal_rollups (user_id, period, period_start, reframing_method, entries)
+    SELECT user_id, 'day', substr(created_at, 1, 10), reframing_method, count(*)
+    FROM thought_journal
+    GROUP BY 1, 3, 4
+    ''')
+
+    conn.execute('''
+    INSERT INTO journal_rollups (user_id, period, period_start, reframing_method, entries)
+    SELECT user_id, 'week', date(created_at, 'weekday 0', '-6 days'), reframing_method, count(*)
+    FROM thought_journal
+    GROUP BY 1, 3, 4
+    ''')
+
+def _partition_journal_search(conn):
+    """Version 7: add each entry's owner to the full-text index."""
+    # All users share one index, so a search used to find every user's
+    # matching entries before filtering by user. Each entry now also indexes
+    # an owner token, the hex of its user_id: a single word whatever the ID
+    # contains, which searches require alongside the query. A virtual
+    # generated column supplies it, so the index can still be rebuilt from
+    # thought_journal. Prefixes of up to four letters now get their own
+    # index too, since longer ones are looked up by merging the entries of
+    # every word they start, across all users.
+    conn.execute('''
+    ALTER TABLE thought_journal
+    ADD COLUMN search_owner TEXT GENERATED ALWAYS AS (hex(user_id)) VIRTUAL
+    ''')
+
+    for trigger in ('insert', 'delete', 'update'):
+        conn.execute(f'DROP TRIGGER thought_journal_fts_{trigger}')
+    conn.execute('DROP TABLE thought_journal_fts')
+
+    conn.execute('''
+    CREATE VIRTUAL TABLE thought_journal_fts USING fts5(
+        search_owner,
+        original_thought,
+        reframed_thought,
+        content='thought_journal',
+        content_rowid='id',
+        prefix='2 3 4'
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER thought_journal_fts_insert AFTER INSERT ON thought_journal BEGIN
+        INSERT INTO thought_journal_fts (rowid, search_owner, original_thought, reframed_thought)
+        VALUES (new.id, new.search_owner, new.original_thought, new.reframed_thought);
+    END
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER thought_journal_fts_delete AFTER DELETE ON thought_journal BEGIN
+        INSERT INTO thought_journal_fts (thought_journal_fts, rowid, search_owner, original_thought,
+                                         reframed_thought)
+        VALUES ('delete', old.id, old.search_owner, old.original_thought, old.reframed_thought);
+    END
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER thought_journal_fts_update
+    AFTER UPDATE OF user_id, original_thought, reframed_thought ON thought_journal BEGIN
+        INSERT INTO thought_journal_fts (thought_journal_fts, rowid, search_owner, original_thought,
+                                         reframed_thought)
+        VALUES ('delete', old.id, old.search_owner, old.original_thought, old.reframed_thought);
+        INSERT INTO thought_journal_fts (rowid, search_owner, original_thought, reframed_thought)
+        VALUES (new.id, new.search_owner, new.original_thought, new.reframed_thought);
+    END
+    ''')
+
+    conn.execute("INSERT INTO thought_journal_fts (thought_journal_fts) VALUES ('rebuild')")
+
+MIGRATIONS = [
+    _create_tables,
+    _index_created_at,
+    _create_ai_response_cache,
+    _partition_by_user,
+    _create_journal_search,
+    _create_journal_rollups,
+    _partition_journal_search,
+]
+
+# The version a fully migrated database reports
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def get_schema_version(conn):
+    """Return the schema version recorded in the database.
+
+    Args:
+        conn (sqlite3.Connection): An open database connection
+
+    Returns:
+        int: The current ``PRAGMA user_version``
+    """
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn):
+    """Apply any migrations the database has not seen yet.
+
+    An up-to-date database costs a single pragma read. Otherwise the pending
+    migrations and the new version number are written in one transaction, so
+    a failed migration leaves the database at its previous version.
+
+    Args:
+        conn (sqlite3.Connection): An open database connection
+
+    Returns:
+        int: The schema version after migrating
+    """
+    if get_schema_version(conn) >= SCHEMA_VERSION:
+        return SCHEMA_VERSION
+
+    # Take the write lock before re-reading the version so that two processes
+    # starting at once do not both apply the same migrations
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        version = get_schema_version(conn)
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            migration(conn)
+            conn.execute(f'PRAGMA user_version = {number}')
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return get_schema_version(conn)
+
+# PostgreSQL migrations. The PostgreSQL backend started out at the schema of
+# SQLite version 4, so its first migration creates that schema directly;
+# later ones mirror the SQLite migrations from version 5 on. SQLite version
+# 7 has no counterpart: PostgreSQL searches within the user's rows already.
+# Timestamps are stored as the same 'YYYY-MM-DD HH:MM:SS' UTC text SQLite's
+# CURRENT_TIMESTAMP produces, so queries and cursors work the same on both.
+POSTGRES_TIMESTAMP_DEFAULT = "to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS')"
+
+# Key for the advisory lock that serializes concurrent migrations
+POSTGRES_MIGRATION_LOCK_ID = 7_411_001
+
+def _postgres_create_schema(conn):
+    """PostgreSQL version 1: tables equivalent to SQLite version 4."""
+    conn.execute(f'''
+    CREATE TABLE thought_journal (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER_ID}',
+        original_thought TEXT NOT NULL,
+        reframed_thought TEXT NOT NULL,
+        reframing_method TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT {POSTGRES_TIMESTAMP_DEFAULT}
+    )
+    ''')
+
+    conn.execute(f'''
+    CREATE TABLE daily_messages (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER_ID}',
+        message TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT {POSTGRES_TIMESTAMP_DEFAULT}
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE user_preferences (
+        user_id TEXT PRIMARY KEY,
+        nickname TEXT DEFAULT 'Boopie',
+        last_login TEXT
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE ai_response_cache (
+        cache_key TEXT PRIMARY KEY,
+        response TEXT NOT NULL,
+        created_at DOUBLE PRECISION NOT NULL
+    )
+    ''')
+
+    # Unlike SQLite, PostgreSQL indexes do not carry the row id, so it is
+    # added explicitly for the (created_at, id) keyset cursors
+    conn.execute('''
+    CREATE INDEX idx_thought_journal_user_created_at
+    ON thought_journal (user_id, created_at, id)
+    ''')
+
+    conn.execute('''
+    CREATE INDEX idx_daily_messages_user_created_at
+    ON daily_messages (user_id, created_at, id)
+    ''')
+
+    conn.execute('''
+    CREATE INDEX idx_ai_response_cache_created_at
+    ON ai_response_cache (created_at)
+    ''')
+
+    conn.execute('''
+    INSERT INTO user_preferences (user_id, nickname, last_login)
+    VALUES (?, 'Boopie', ?)
+    ''', (DEFAULT_USER_ID, datetime.datetime.now().isoformat(sep=' ')))
+
+def _postgres_create_journal_search(conn):
+    """PostgreSQL version 2: full-text index over journal entries."""
+    # A generated column stays in sync with the text without any triggers.
+    # As on SQLite, words are indexed as written rather than stemmed.
+    conn.execute('''
+    ALTER TABLE thought_journal
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', original_thought), 'A') ||
+        setweight(to_tsvector('simple', reframed_thought), 'B')
+    ) STORED
+    ''')
+
+    conn.execute('''
+    CREATE INDEX idx_thought_journal_search
+    ON thought_journal USING GIN (search_vector)
+    ''')
+
+def _postgres_create_journal_rollups(conn):
+    """PostgreSQL version 3: journal_rollups, as in SQLite version 6."""
+    conn.execute('''
+    CREATE TABLE journal_rollups (
+        user_id TEXT NOT NULL,
+        period TEXT NOT NULL,
+        period_start TEXT NOT NULL,
+        reframing_method TEXT NOT NULL,
+        entries INTEGER NOT NULL,
+        PRIMARY KEY (user_id, period, period_start, reframing_method)
+    )
+    ''')
+
+    # The week of a 'YYYY-MM-DD HH:MM:SS' timestamp, as the date of its Monday
+    conn.execute('''
+    CREATE FUNCTION journal_rollup_week(created_at TEXT) RETURNS TEXT
+    LANGUAGE sql IMMUTABLE
+    AS $$ SELECT to_char(date_trunc('week', created_at::timestamp), 'YYYY-MM-DD') $$
+    ''')
+
+    conn.execute('''
+    CREATE FUNCTION thought_journal_rollups() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE journal_rollups SET entries = entries - 1
+            WHERE user_id = OLD.user_id AND reframing_method = OLD.reframing_method
+              AND ((period = 'day' AND period_start = left(OLD.created_at, 10))
+                OR (period = 'week' AND period_start = journal_rollup_week(OLD.created_at)));
+            DELETE FROM journal_rollups WHERE user_id = OLD.user_id AND entries <= 0;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO journal_rollups (user_id, period, period_start, reframing_method, entries)
+            VALUES (NEW.user_id, 'day', left(NEW.created_at, 10), NEW.reframing_method, 1),
+                   (NEW.user_id, 'week', journal_rollup_week(NEW.created_at),
+                    NEW.reframing_method, 1)
+            ON CONFLICT (user_id, period, period_start, reframing_method)
+            DO UPDATE SET entries = journal_rollups.entries + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER thought_journal_rollups
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, reframing_method, created_at
+    ON thought_journal
+    FOR EACH ROW EXECUTE FUNCTION thought_journal_rollups()
+    ''')
+
+    # Count the entries written before the trigger existed
+    conn.execute('''
+    INSERT INTO journal_rollups (user_id, period, period_start, reframing_method, entries)
+    SELECT user_id, 'day', left(created_at, 10), reframing_method, count(*)
+    FROM thought_journal
+    GROUP BY 1, 3, 4
+    ''')
+
+    conn.execute('''
+    INSERT INTO journal_rollups (user_id, period, period_start, reframing_method, entries)
+    SELECT user_id, 'week', journal_rollup_week(created_at), reframing_method, count(*)
+    FROM thought_journal
+    GROUP BY 1, 3, 4
+    ''')
+
+POSTGRES_MIGRATIONS = [
+    _postgres_create_schema,
+    _postgres_create_journal_search,
+    _postgres_create_journal_rollups,
+]
+
+POSTGRES_SCHEMA_VERSION = len(POSTGRES_MIGRATIONS)
+
+def migrate_postgres(conn):
+    """Apply any PostgreSQL migrations the database has not seen yet.
+
+    Concurrent callers (several app instances starting at once) are
+    serialized with an advisory lock held until the transaction ends.
+
+    Args:
+        conn (storage.PostgresConnection): An open database connection
+
+    Returns:
+        int: The schema version after migrating
+    """
+    conn.execute('CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)')
+    conn.execute('SELECT pg_advisory_xact_lock(?)', (POSTGRES_MIGRATION_LOCK_ID,))
+    row = conn.execute('SELECT version FROM schema_version').fetchone()
+    if row is None:
+        conn.execute('INSERT INTO schema_version (version) VALUES (0)')
+        version = 0
+    else:
+        version = row['version']
+
+    try:
+        for number, migration in enumerate(POSTGRES_MIGRATIONS[version:], start=version + 1):
+            migration(conn)
+            conn.execute('UPDATE schema_version SET version = ?', (number,))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return max(version, POSTGRES_SCHEMA_VERSION)
@@ -0,0 +1,151 @@
+import os
+import logging
+import functools
+import string
+
+logger = logging.getLogger(__name__)
+
+# Prompt templates for ai_helper.
+#
+# Every request starts with the same system message: who Bean is talking to
+# and everything he knows about her. It is built once, at import, so it is
+# byte-identical in every request and the provider can serve that prefix
+# from its prompt cache (OpenAI caches prefixes of 1024 tokens or more).
+# What differs between requests, the task and the user's input, comes after
+# it in the user message.
+#
+# Prompts are counted before they are sent and the user's input is cut
+# short if the whole prompt would exceed MAX_PROMPT_TOKENS. Counting uses
+# tiktoken when it is installed (the optional ``tokens`` dependencies) and
+# its encoding can be loaded, and a characters-per-token estimate otherwise.
+
+MAX_PROMPT_TOKENS = int(os.environ.get("AI_MAX_PROMPT_TOKENS", 1000))
+
+# Used when tiktoken is not installed; errs on the side of overcounting
+CHARS_PER_TOKEN = 3.5
+
+# Chat formatting adds a few tokens around every message
+TOKENS_PER_MESSAGE = 4
+
+PERSONA = """You are Krish (Bean), a supportive, loving boyfriend talking to your girlfriend Hiya (Boopie).
+
+What you know about her and about the two of you:
+- She attends Purdue University and lives in West Lafayette. You go to Penn State, and you often joke that Penn State is better.
+- You started dating on June 27, 2024.
+- You both want to travel to Paris and Greece someday, and to have a husky in the future.
+- Her favorite song is "ilym" by John K.
+- You gave her a bunny plushie named Daisy. She gave you a bat plushie named Drax.
+- She has hazel eyes and long beautiful hair, loves Kinder Joy and loves Lord of the Rings.
+- You both have trypophobia.
+
+Use personal details, inside jokes, and warm reassurance. Speak as if you're talking directly to her."""
+
+SYSTEM_PROMPT = {"role": "system", "content": PERSONA}
+
+class PromptTemplate:
+    """The user message of one kind of request.
+
+    The template is compiled once; ``$input`` marks where the user's text
+    goes.
+    """
+
+    def __init__(self, name, template):
+        self.name = name
+        self._template = string.Template(template.strip())
+
+    @functools.cached_property
+    def static_tokens(self):
+        """Everything but the user's input, counted on first use.
+
+        Not counted at import: loading the tokenizer can take a download.
+        """
+        return (count_tokens(PERSONA) + count_tokens(self._template.template)
+                + 2 * TOKENS_PER_MESSAGE)
+
+    def messages(self, text="", max_prompt_tokens=None):
+        """Build the chat messages for a request.
+
+        Args:
+            text (str): The user's input
+            max_prompt_tokens (int): Overrides ``MAX_PROMPT_TOKENS``
+
+        Returns:
+            tuple: ``(messages, text)``, ``text`` being the input as sent,
+            which is shortened if the prompt would be too long
+        """
+        limit = MAX_PROMPT_TOKENS if max_prompt_tokens is None else max_prompt_tokens
+        text = truncate_to_tokens(text, limit - self.static_tokens)
+        user = self._template.substitute(input=text)
+        return [SYSTEM_PROMPT, {"role": "user", "content": user}], text
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    """Return the tiktoken encoding, or None when it is not available."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        # The first use downloads the encoding, which fails offline
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("Could not load the tiktoken encoding, estimating token counts: %s", e)
+        return None
+
+def count_tokens(text):
+    """Count the tokens in a piece of text.
+
+    Args:
+        text (str): The text to count
+
+    Returns:
+        int: The exact count with tiktoken, an estimate without it
+    """
+    encoding = _encoding()
+    if encoding is None:
+        return int(len(text) / CHARS_PER_TOKEN) + 1
+    return len(encoding.encode(text))
+
+def truncate_to_tokens(text, max_tokens):
+    """Cut text short so that it fits in a number of tokens.
+
+    Args:
+        text (str): The text to shorten
+        max_tokens (int): How many tokens it may take at most
+
+    Returns:
+        str: The text, ending in "..." if it had to be shortened
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    logger.warning("Prompt input of %d tokens cut to %d", count_tokens(text), max_tokens)
+    max_tokens = max(max_tokens - 1, 0)
+    encoding = _encoding()
+    if encoding is None:
+        return text[:int(max_tokens * CHARS_PER_TOKEN)] + "..."
+    return encoding.decode(encoding.encode(text)[:max_tokens]) + "..."
+
+REFRAMING = PromptTemplate("reframing", """
+Provide a kind, thoughtful reframing of this overthinking thought.
+Keep your response to 3-4 sentences maximum. Be warm, loving, and supportive.
+
+Her overthinking thought: "$input"
+
+Your reframing as Bean:
+""")
+
+ADVICE = PromptTemplate("advice", """
+Provide personalized advice for this situation.
+Give practical, helpful advice while being supportive. Keep your response to 3-5 sentences.
+
+Situation: "$input"
+
+Your advice as Bean:
+""")
+
+AFFIRMATION = PromptTemplate("affirmation", """
+Create a single personalized affirmation for her.
+Include one specific personal detail about her or the two of you.
+Make it affirming, supportive, and loving with a touch of humor or playfulness.
+Keep it short (15-25 words maximum).
+""")
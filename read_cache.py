@@ -0,0 +1,156 @@
+import os
+import time
+import datetime
+import threading
+import collections
+
+import database as db
+
+# Read-through cache for database reads, kept per Streamlit session. Each
+# cached result remembers the data versions (see database.data_version()) of
+# the tables it was read from and is served until one of them changes, so
+# reruns caused by typing or clicking do not query the database at all while
+# a write shows up on the very next rerun.
+
+# Cached reads are also refreshed after this many seconds, to pick up rows
+# written by other app instances sharing the database. 0 disables caching.
+READ_CACHE_MAX_AGE_SECONDS = float(os.environ.get("READ_CACHE_MAX_AGE_SECONDS", 30))
+
+# Most results a session keeps, least recently used evicted first
+READ_CACHE_MAX_ENTRIES = int(os.environ.get("READ_CACHE_MAX_ENTRIES", 64))
+
+def for_session(session_state):
+    """Return a Streamlit session's read cache, creating it on first use.
+
+    Only the pages that read the database call this, so the others never
+    import it.
+
+    Args:
+        session_state: ``st.session_state``
+    """
+    if 'read_cache' not in session_state:
+        session_state.read_cache = ReadCache()
+    return session_state.read_cache
+
+class ReadCache:
+    """Memoize database reads until the tables they read are written to."""
+
+    def __init__(self, max_age_seconds=READ_CACHE_MAX_AGE_SECONDS,
+                 max_entries=READ_CACHE_MAX_ENTRIES):
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = collections.Counter()
+
+    def get(self, key, read, tables, user_id=db.DEFAULT_USER_ID):
+        """Return the cached result for a key, calling ``read()`` on a miss.
+
+        Args:
+            key: Any hashable identifying the read, including its arguments
+            read (callable): Reads from the database and returns the result
+            tables (tuple): The tables ``read()`` depends on
+            user_id (str): The user whose rows ``read()`` returns
+
+        Returns:
+            The result of ``read()``, possibly from an earlier call
+        """
+        # Taken before reading, so a write that lands mid-read invalidates it
+        versions = tuple(db.data_version(table, user_id) for table in tables)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry is not None and entry[1] == versions
+                    and now - entry[2] < self.max_age_seconds):
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+            self._stats["misses"] += 1
+
+        result = read()
+        if self.max_age_seconds > 0:
+            with self._lock:
+                self._entries[key] = (result, versions, now)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Forget every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit and miss counters."""
+        with self._lock:
+            return dict(self._stats)
+
+def today_message(cache, user_id=db.DEFAULT_USER_ID):
+    """Cached ``database.get_today_message()``."""
+    # The date is part of the key so the message changes at midnight
+    return cache.get(('today_message', user_id, datetime.date.today()),
+                     lambda: db.get_today_message(user_id),
+                     ('daily_messages',), user_id)
+
+def thought_entries_page(cache, cursor=None, user_id=db.DEFAULT_USER_ID, format_entry=None):
+    """Cached ``database.get_thought_entries_page()``.
+
+    Args:
+        cache (ReadCache): The session's cache
+        cursor (tuple): As for ``get_thought_entries_page()``
+        user_id (str): The user whose journal to read
+        format_entry (callable): Called on every entry of a page when it is
+            read, e.g. to add display fields, so cached pages need no work
+
+    Returns:
+        tuple: ``(entries, next_cursor)``
+    """
+    def read():
+        entries, next_cursor = db.get_thought_entries_page(cursor=cursor, user_id=user_id)
+        return [format_entry(entry) if format_entry else entry for entry in entries], next_cursor
+
+    return cache.get(('thought_entries_page', user_id, cursor), read,
+                     ('thought_journal',), user_id)
+
+def search_thought_entries(cache, query, offset=0, user_id=db.DEFAULT_USER_ID, format_entry=None):
+    """Cached ``database.search_thought_entries()``.
+
+    Args:
+        cache (ReadCache): The session's cache
+        query (str): The words to search for
+        offset (int): As for ``search_thought_entries()``
+        user_id (str): The user whose journal to search
+        format_entry (callable): See ``thought_entries_page()``
+
+    Returns:
+        tuple: ``(entries, next_offset)``
+    """
+    def read():
+        entries, next_offset = db.search_thought_entries(query, offset=offset, user_id=user_id)
+        return [format_entry(entry) if format_entry else entry for entry in entries], next_offset
+
+    return cache.get(('search_thought_entries', user_id, query, offset), read,
+                     ('thought_journal',), user_id)
+
+def journal_rollups(cache, period, since=None, user_id=db.DEFAULT_USER_ID):
+    """Cached ``database.get_journal_rollups()``."""
+    return cache.get(('journal_rollups', user_id, period, since),
+                     lambda: db.get_journal_rollups(period, since, user_id),
+                     ('thought_journal',), user_id)
+
+def journal_themes(cache, user_id=db.DEFAULT_USER_ID):
+    """Cached ``themes.get_top_themes()``."""
+    # Imported here so that pages without themes do not load NumPy
+    import themes
+    return cache.get(('journal_themes', user_id),
+                     lambda: themes.get_top_themes(user_id=user_id),
+                     ('thought_journal',), user_id)
+
+def past_reframing(cache, original_thought, user_id=db.DEFAULT_USER_ID):
+    """Cached ``ai_helper.find_past_reframing()``."""
+    import ai_helper
+    return cache.get(('past_reframing', user_id, original_thought),
+                     lambda: ai_helper.find_past_reframing(original_thought, user_id),
+                     ('thought_journal',), user_id)
@@ -0,0 +1,195 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Retry and circuit breaker helpers for calls to the AI provider.
+#
+# Transient failures (rate limits, timeouts, connection errors and 5xx
+# responses) are retried with capped exponential backoff and full jitter,
+# always within an overall deadline. Repeated transient failures open the
+# circuit breaker, after which calls fail immediately with CircuitOpenError
+# until a trial call succeeds again.
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit is open."""
+
+class CircuitBreaker:
+    """A thread-safe consecutive-failure circuit breaker.
+
+    The breaker opens after ``failure_threshold`` consecutive failures. Once
+    ``recovery_timeout`` seconds have passed it lets a single trial call
+    through (half-open); success closes it again, failure re-opens it. A
+    trial that never reports back does not hold the breaker half-open for
+    good: after another ``recovery_timeout`` the next call becomes the trial.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """The current state: ``closed``, ``open`` or ``half-open``."""
+        with self._lock:
+            return self._state
+
+    def allow(self):
+        """Return True if a call may go ahead right now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if ((self._state == self.OPEN and now - self._opened_at >= self.recovery_timeout)
+                    or (self._state == self.HALF_OPEN
+                        and now - self._trial_started_at >= self.recovery_timeout)):
+                # Let exactly one trial call through
+                self._state = self.HALF_OPEN
+                self._trial_started_at = now
+                return True
+            return False
+
+    def record_success(self):
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit if it keeps failing."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("Circuit opened after %d consecutive failures", self._failures)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_abandoned(self):
+        """Record that an allowed call ended without a result, e.g. cancelled.
+
+        A trial call that ends this way counts as failed, re-opening the
+        circuit; otherwise nothing is recorded.
+        """
+        with self._lock:
+            abandoned_trial = self._state == self.HALF_OPEN
+        if abandoned_trial:
+            self.record_failure()
+
+def is_retryable(error):
+    """Return True for errors that are likely to go away on their own.
+
+    Args:
+        error (Exception): The error raised by the provider call
+    """
+    # Imported here so that loading this module does not load the SDK
+    import openai
+
+    if isinstance(error, (openai.RateLimitError, openai.APITimeoutError,
+                          openai.APIConnectionError, openai.InternalServerError,
+                          asyncio.TimeoutError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """Return a jittered delay before retry number ``attempt`` (starting at 0)."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+def call_with_retry(call, breaker, deadline, max_attempts=3, base_delay=0.5, max_delay=4.0):
+    """Call ``call(timeout)`` with retries, a deadline and a circuit breaker.
+
+    Args:
+        call (callable): Makes one attempt; receives the seconds left before
+            the deadline and should use them as its own timeout
+        breaker (CircuitBreaker): Breaker guarding the provider
+        deadline (float): Seconds the whole call, retries included, may take
+        max_attempts (int): Maximum number of attempts
+        base_delay (float): Backoff before the first retry, in seconds
+        max_delay (float): Upper bound for any single backoff
+
+    Returns:
+        Whatever ``call`` returns
+
+    Raises:
+        CircuitOpenError: If the breaker is open
+        TimeoutError: If the deadline passes before a retry can be made
+    """
+    deadline_at = time.monotonic() + deadline
+    for attempt in range(max_attempts):
+        # Checked before asking the breaker, which may start a trial call
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Deadline exceeded before the request could be made")
+
+        if not breaker.allow():
+            raise CircuitOpenError("The AI provider is unavailable")
+
+        recorded = False
+        try:
+            result = call(remaining)
+        except Exception as e:
+            recorded = True
+            if not is_retryable(e):
+                # The provider answered; the request itself was wrong
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            if attempt + 1 == max_attempts or time.monotonic() + delay >= deadline_at:
+                raise
+            logger.info("Retrying after %s (attempt %d of %d)", type(e).__name__, attempt + 1, max_attempts)
+            time.sleep(delay)
+        else:
+            recorded = True
+            breaker.record_success()
+            return result
+        finally:
+            if not recorded:
+                breaker.record_abandoned()
+
+async def acall_with_retry(call, breaker, deadline, max_attempts=3, base_delay=0.5, max_delay=4.0):
+    """Async version of ``call_with_retry()``; ``call(timeout)`` returns an awaitable."""
+    deadline_at = time.monotonic() + deadline
+    for attempt in range(max_attempts):
+        # Checked before asking the breaker, which may start a trial call
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Deadline exceeded before the request could be made")
+
+        if not breaker.allow():
+            raise CircuitOpenError("The AI provider is unavailable")
+
+        recorded = False
+        try:
+            result = await call(remaining)
+        except Exception as e:
+            recorded = True
+            if not is_retryable(e):
+                # The provider answered; the request itself was wrong
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            if attempt + 1 == max_attempts or time.monotonic() + delay >= deadline_at:
+                raise
+            logger.info("Retrying after %s (attempt %d of %d)", type(e).__name__, attempt + 1, max_attempts)
+            await asyncio.sleep(delay)
+        else:
+            recorded = True
+            breaker.record_success()
+            return result
+        finally:
+            if not recorded:
+                breaker.record_abandoned()
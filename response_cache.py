@@ -0,0 +1,137 @@
+import collections
+import hashlib
+import json
+import logging
+import threading
+import time
+
+import database as db
+
+logger = logging.getLogger(__name__)
+
+# Two-tier cache for AI responses: a small in-memory LRU in front of the
+# ai_response_cache table, so identical requests skip the API round trip even
+# after a restart.
+
+def normalize_input(text):
+    """Normalize user input so trivially different requests share a cache entry.
+
+    Args:
+        text (str): The raw user input
+
+    Returns:
+        str: The input with case and whitespace differences removed
+    """
+    return " ".join(text.split()).casefold()
+
+def make_key(function, model, text, temperature, max_tokens):
+    """Build the cache key for a completion request.
+
+    Args:
+        function (str): Name of the generating function
+        model (str): The model used for the completion
+        text (str): The user input the response depends on
+        temperature (float): Sampling temperature
+        max_tokens (int): Completion token limit
+
+    Returns:
+        str: A hex digest identifying the request
+    """
+    payload = json.dumps([function, model, normalize_input(text), temperature, max_tokens])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """An in-memory LRU cache backed by a database table.
+
+    Entries expire ``ttl_seconds`` after they were generated. The memory tier
+    holds at most ``max_memory_entries`` and evicts the least recently used
+    entry; the database tier keeps the ``max_disk_entries`` newest entries.
+    """
+
+    def __init__(self, ttl_seconds, max_memory_entries, max_disk_entries, persistent=True):
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.persistent = persistent
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = collections.Counter()
+
+    def get(self, key, ttl_seconds=None):
+        """Return the cached response for a key, or None on a miss.
+
+        Args:
+            key (str): The cache key from ``make_key()``
+            ttl_seconds (float): Overrides the default time to live
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        min_created_at = time.time() - ttl
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] >= min_created_at:
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return entry[0]
+
+        if self.persistent:
+            try:
+                stored = db.get_cached_response(key, min_created_at)
+            except db.DATABASE_ERRORS:
+                logger.exception("Could not read the AI response cache")
+                stored = None
+            if stored is not None:
+                self._remember(key, *stored)
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+                return stored[0]
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key, response):
+        """Store a response in both tiers.
+
+        Args:
+            key (str): The cache key from ``make_key()``
+            response (str): The generated response
+        """
+        created_at = time.time()
+        self._remember(key, response, created_at)
+        if self.persistent:
+            try:
+                db.save_cached_response(key, response, created_at, self.max_disk_entries)
+            except db.DATABASE_ERRORS:
+                logger.exception("Could not write the AI response cache")
+
+    def _remember(self, key, response, created_at):
+        with self._lock:
+            self._entries[key] = (response, created_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_memory_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached response and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+        if self.persistent:
+            db.clear_cached_responses()
+
+    def stats(self):
+        """Return hit and miss counters.
+
+        Returns:
+            dict: ``memory_hits``, ``disk_hits``, ``misses`` and ``hit_rate``
+        """
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                "memory_hits": self._stats["memory_hits"],
+                "disk_hits": self._stats["disk_hits"],
+                "misses": self._stats["misses"],
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import Future
+
+# Single-flight call coalescing: while a call for a key is in progress, other
+# threads asking for the same key wait for that call's result instead of
+# making their own. If the caller making the call goes away before it
+# finishes (a closed generator, a cancelled task), the waiting callers get
+# Abandoned rather than its cancellation, and one of them takes over.
+
+class Abandoned(Exception):
+    """The caller making a shared call stopped before it finished."""
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def claim(self, key):
+        """Join the in-flight call for a key, or become the one making it.
+
+        The caller that gets ``leader=True`` must make the call and then pass
+        its outcome to ``release()``. Everyone else waits on the future.
+
+        Args:
+            key: Any hashable identifying the call
+
+        Returns:
+            tuple: ``(future, leader)``
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def release(self, key, future, result=None, error=None):
+        """Finish a claimed call and hand its outcome to the waiting callers.
+
+        Args:
+            key: The key passed to ``claim()``
+            future (Future): The future returned by ``claim()``
+            result: The call's result
+            error (BaseException): The call's error, if it failed. Anything
+                that is not an ``Exception``, such as a cancellation, is
+                handed on as ``Abandoned``
+        """
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None and not isinstance(error, Exception):
+            error = Abandoned(f"The shared call was abandoned ({type(error).__name__})")
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn, *args, **kwargs):
+        """Call ``fn(*args, **kwargs)`` unless an identical call is in flight.
+
+        Args:
+            key: Any hashable identifying the call
+            fn (callable): The function to call
+
+        Returns:
+            The result of the one shared call; its error is raised for every
+            caller, unless the call was abandoned, in which case a waiting
+            caller makes it again
+        """
+        future, leader = self.claim(key)
+        while not leader:
+            try:
+                return future.result()
+            except Abandoned:
+                future, leader = self.claim(key)
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.release(key, future, error=e)
+            raise
+        self.release(key, future, result)
+        return result
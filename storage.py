@@ -0,0 +1,251 @@
+import os
+import queue
+import sqlite3
+import itertools
+import contextlib
+import migrations
+
+# Storage backends for database.py.
+#
+# A backend hands out pooled connections whose ``execute()`` takes SQL with
+# ``?`` placeholders and returns rows that can be indexed by column name, so
+# the queries in database.py run unchanged on either backend:
+#
+# * SQLiteStorage keeps the data in a local file. This is the default.
+# * PostgresStorage connects to a shared PostgreSQL server, so several app
+#   instances (e.g. an autoscaled deployment) see the same journal and daily
+#   messages. It is used when DATABASE_URL is a postgres:// URL and needs the
+#   optional ``postgres`` dependencies (psycopg and psycopg-pool).
+
+# Errors raised by the backends. psycopg takes a while to import, so it is
+# only loaded, and its error class added here, once a PostgreSQL backend is
+# opened.
+DATABASE_ERRORS = (sqlite3.Error,)
+
+# SQLite connection tuning. Idle connections are kept around and reused by
+# every Streamlit script thread instead of reconnecting on each call.
+SQLITE_POOL_SIZE = 8
+STATEMENT_CACHE_SIZE = 128  # prepared statements cached per connection
+PAGE_CACHE_KIB = 8192       # page cache per connection (PRAGMA cache_size)
+BUSY_TIMEOUT_SECONDS = 5.0
+
+# Rows fetched at a time by stream_query()
+STREAM_BATCH_SIZE = 1000
+
+# PostgreSQL pool limits, per app process
+POSTGRES_POOL_MIN_SIZE = int(os.environ.get("DATABASE_POOL_MIN_SIZE", 1))
+POSTGRES_POOL_MAX_SIZE = int(os.environ.get("DATABASE_POOL_MAX_SIZE", 10))
+
+def connect_sqlite(path):
+    """Open a new, tuned connection to a SQLite database file."""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS,
+                           check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA cache_size=-{PAGE_CACHE_KIB}')
+    return conn
+
+class ConnectionPool:
+    """A small thread-safe pool of SQLite connections.
+
+    A connection is only ever used by one thread at a time: it is taken out of
+    the pool for the duration of a ``with pool.connection()`` block and put
+    back afterwards. When every pooled connection is busy a new one is opened,
+    and surplus connections are closed on release instead of being kept.
+    """
+
+    def __init__(self, connect, size=SQLITE_POOL_SIZE):
+        self._connect = connect
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._closed = False
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a connection from the pool for the duration of a block."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            # Never hand a connection with an open transaction to someone else
+            if conn.in_transaction:
+                conn.rollback()
+            self._release(conn)
+
+    def _release(self, conn):
+        if self._closed:
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        """Close every idle connection and stop pooling new ones."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+class SQLiteStorage:
+    """Storage in a local SQLite file."""
+
+    dialect = 'sqlite'
+
+    def __init__(self, path, pool_size=SQLITE_POOL_SIZE):
+        self.path = path
+        # Create a directory for the database if it doesn't exist
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._pool = ConnectionPool(lambda: connect_sqlite(path), pool_size)
+
+    def connection(self):
+        """Borrow a pooled connection (use as a context manager)."""
+        return self._pool.connection()
+
+    def migrate(self):
+        """Bring the schema up to date and return its version."""
+        with self.connection() as conn:
+            return migrations.migrate(conn)
+
+    def close(self):
+        """Close every pooled connection."""
+        self._pool.close()
+
+# Server-side cursors need a name unique within their connection
+_stream_cursor_ids = itertools.count()
+
+class PostgresConnection:
+    """Wraps a psycopg connection so it accepts the SQLite-style queries."""
+
+    def __init__(self, conn):
+        self.raw = conn
+
+    @staticmethod
+    def _translate(sql):
+        # psycopg uses %s placeholders, so literal percent signs need escaping
+        return sql.replace('%', '%%').replace('?', '%s')
+
+    def execute(self, sql, params=()):
+        return self.raw.execute(self._translate(sql), params)
+
+    def executemany(self, sql, seq_of_params):
+        cursor = self.raw.cursor()
+        cursor.executemany(self._translate(sql), seq_of_params)
+        return cursor
+
+    def stream(self, sql, params=(), batch_size=None):
+        """Yield a query's rows, fetched from a server-side cursor in batches."""
+        # A named cursor keeps the result on the server instead of sending
+        # all of it at once
+        with self.raw.cursor(name=f"stream_{next(_stream_cursor_ids)}") as cursor:
+            cursor.itersize = batch_size or STREAM_BATCH_SIZE
+            cursor.execute(self._translate(sql), params)
+            yield from cursor
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    @property
+    def in_transaction(self):
+        from psycopg.pq import TransactionStatus
+        return self.raw.info.transaction_status != TransactionStatus.IDLE
+
+class PostgresStorage:
+    """Storage on a PostgreSQL server shared by every app instance."""
+
+    dialect = 'postgresql'
+
+    def __init__(self, url, min_size=POSTGRES_POOL_MIN_SIZE, max_size=POSTGRES_POOL_MAX_SIZE):
+        global DATABASE_ERRORS
+        try:
+            import psycopg
+            import psycopg_pool
+            from psycopg.rows import dict_row
+        except ImportError as e:
+            raise RuntimeError(
+                "DATABASE_URL points at PostgreSQL but psycopg is not installed; "
+                "install the 'postgres' optional dependencies"
+            ) from e
+        DATABASE_ERRORS = (sqlite3.Error, psycopg.Error)
+        self._pool = psycopg_pool.ConnectionPool(
+            url,
+            min_size=min_size,
+            max_size=max_size,
+            kwargs={'row_factory': dict_row},
+            name='soulsoother',
+            open=True,
+        )
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a pooled connection (use as a context manager)."""
+        with self._pool.connection() as raw:
+            conn = PostgresConnection(raw)
+            try:
+                yield conn
+            finally:
+                # Match SQLite: work that was not committed is discarded
+                if conn.in_transaction:
+                    conn.rollback()
+
+    def migrate(self):
+        """Bring the schema up to date and return its version."""
+        with self.connection() as conn:
+            return migrations.migrate_postgres(conn)
+
+    def close(self):
+        """Close every pooled connection."""
+        self._pool.close()
+
+def stream_query(conn, sql, params=(), batch_size=STREAM_BATCH_SIZE):
+    """Yield the rows of a query without holding all of them in memory.
+
+    SQLite produces rows as the cursor steps through them; PostgreSQL uses a
+    server-side cursor. Either way at most ``batch_size`` rows are held at
+    once.
+
+    Args:
+        conn: A connection borrowed from either backend
+        sql (str): The query, with ``?`` placeholders
+        params (tuple): The query parameters
+        batch_size (int): Rows fetched at a time
+
+    Yields:
+        Rows that can be indexed by column name
+    """
+    if isinstance(conn, PostgresConnection):
+        yield from conn.stream(sql, params, batch_size)
+        return
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+def open_storage(url, sqlite_path):
+    """Open the backend selected by a database URL.
+
+    Args:
+        url (str): A ``postgres://`` or ``postgresql://`` URL, or None/empty
+            for SQLite
+        sqlite_path (str): Database file to use when ``url`` is not PostgreSQL
+
+    Returns:
+        SQLiteStorage or PostgresStorage: The opened backend
+    """
+    if url and url.startswith(('postgres://', 'postgresql://')):
+        return PostgresStorage(url)
+    return SQLiteStorage(sqlite_path)
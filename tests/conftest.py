@@ -0,0 +1,95 @@
+"""Shared fixtures: an empty database and cache, and stub OpenAI clients.
+
+The stubs count their calls and take a moment to answer, so that callers
+arriving together all find the first call still in flight.
+"""
+import asyncio
+import os
+import threading
+import time
+import types
+
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import ai_helper
+import database as db
+
+REPLY = "You've got this, Boopie."
+UPSTREAM_SECONDS = 0.3
+
+def _response(text):
+    return types.SimpleNamespace(
+        choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=text))],
+        usage=types.SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+    )
+
+class StubCompletions:
+    """Stands in for ``client.chat.completions``, counting upstream calls."""
+
+    def __init__(self, delay=UPSTREAM_SECONDS):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _count(self):
+        with self._lock:
+            self.calls += 1
+
+    def create(self, **kwargs):
+        self._count()
+        time.sleep(self.delay)
+        if kwargs.get("stream"):
+            return self._stream()
+        return _response(REPLY)
+
+    def _stream(self):
+        """Yield the reply a word at a time, ``delay`` apart."""
+        for word in REPLY.split(" "):
+            delta = types.SimpleNamespace(content=word + " ")
+            yield types.SimpleNamespace(usage=None, choices=[types.SimpleNamespace(delta=delta)])
+            time.sleep(self.delay)
+
+class StubAsyncCompletions(StubCompletions):
+
+    async def create(self, **kwargs):
+        self._count()
+        await asyncio.sleep(self.delay)
+        return _response(REPLY)
+
+def _client(completions):
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+
+@pytest.fixture(autouse=True)
+def fresh_state(tmp_path, monkeypatch):
+    """Give every test an empty database and response cache."""
+    db.close_pool()
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "test.db"))
+    ai_helper.cache.clear()
+    ai_helper.breaker.record_success()
+    yield
+    ai_helper.cache.clear()
+    db.close_pool()
+
+@pytest.fixture
+def completions(monkeypatch):
+    """Replace the sync OpenAI client with a stub and return its completions."""
+    stub = StubCompletions()
+    monkeypatch.setattr(ai_helper, "_client", _client(stub))
+    return stub
+
+@pytest.fixture
+def async_completions(monkeypatch):
+    """Replace the async OpenAI client with a stub and return its completions."""
+    stub = StubAsyncCompletions()
+    monkeypatch.setattr(ai_helper._get_async_runtime(), "client", _client(stub))
+    return stub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def app_dir(monkeypatch):
+    """Run from the repository root, since the app loads assets by relative path."""
+    monkeypatch.chdir(ROOT)
+    return ROOT
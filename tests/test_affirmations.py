@@ -0,0 +1,32 @@
+"""On-demand affirmations are never cached; daily ones are cached per user and day."""
+import datetime
+
+import ai_helper
+import daily_messages
+
+def test_on_demand_affirmations_are_generated_every_time(completions):
+    completions.delay = 0
+
+    ai_helper.generate_custom_affirmation()
+    ai_helper.generate_custom_affirmation()
+
+    assert completions.calls == 2
+    assert ai_helper.cache.stats()["misses"] == 0
+
+def test_affirmations_for_a_day_are_cached(async_completions):
+    async_completions.delay = 0
+    today = datetime.date(2026, 10, 18)
+
+    for day in (today, today, today + datetime.timedelta(days=1)):
+        ai_helper.run_async(ai_helper.agenerate_custom_affirmation(for_date=day, fallback=False))
+
+    assert async_completions.calls == 2
+
+def test_every_user_gets_their_own_pregenerated_messages(async_completions):
+    async_completions.delay = 0
+    start = datetime.date(2026, 10, 18)
+
+    for user_id in ("alice", "bob"):
+        assert daily_messages.pregenerate_daily_messages(3, start=start, user_id=user_id) == 3
+
+    assert async_completions.calls == 6
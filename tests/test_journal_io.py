@@ -0,0 +1,64 @@
+"""Backups round-trip, and a malformed one is rejected without a trace."""
+import io
+import json
+
+import pytest
+
+import database as db
+import journal_io
+
+ENTRY = {"table": "thought_journal", "original_thought": "I will fail",
+         "reframed_thought": "I studied", "reframing_method": "self-guided",
+         "created_at": "2026-01-02 03:04:05"}
+
+MESSAGE = {"table": "daily_messages", "message": "Proud of you", "created_at": "2026-01-02"}
+
+def _rows(user_id):
+    return list(journal_io.iter_rows(user_id))
+
+@pytest.mark.parametrize("format", journal_io.FORMATS)
+def test_backup_round_trips(format):
+    for i in range(3):
+        db.save_thought_entry(f"Thought {i}, with a comma", f'Reframed "{i}"\non two lines',
+                              "ai-suggested", "alice")
+    db.save_daily_message("Héllo ❤️", "alice")
+
+    backup = io.StringIO(newline="")
+    journal_io.export(backup, format, "alice")
+    backup.seek(0)
+    added = journal_io.restore(backup, format, "bob")
+
+    assert added == {"thought_journal": 3, "daily_messages": 1}
+    assert _rows("bob") == _rows("alice")
+
+@pytest.mark.parametrize("bad_line, error", [
+    ('["not", "an", "object"]', "expected an object"),
+    ('{not json', "not valid JSON"),
+    (json.dumps(dict(ENTRY, table="secrets")), "unknown table 'secrets'"),
+    (json.dumps({k: v for k, v in ENTRY.items() if k != "reframed_thought"}),
+     "missing 'reframed_thought'"),
+    (json.dumps(dict(ENTRY, reframing_method=None)), "missing 'reframing_method'"),
+    (json.dumps(dict(ENTRY, original_thought=7)), "'original_thought' must be a string"),
+    (json.dumps(dict(MESSAGE, created_at="yesterday")), "bad created_at 'yesterday'"),
+])
+def test_malformed_jsonl_line_is_named_and_nothing_is_imported(bad_line, error):
+    lines = [json.dumps(ENTRY), json.dumps(MESSAGE), bad_line, json.dumps(ENTRY)]
+    backup = io.StringIO("\n".join(lines) + "\n")
+
+    with pytest.raises(ValueError, match=f"^line 3: {error}"):
+        # One row per chunk, so the rows before the bad one are inserted first
+        journal_io.restore(backup, "jsonl", "bob", chunk_size=1)
+
+    assert _rows("bob") == []
+
+def test_malformed_csv_row_is_named_and_nothing_is_imported():
+    backup = io.StringIO(newline="")
+    journal_io.export(backup, "csv", "nobody")
+    backup.write("thought_journal,2026-01-02,I will fail,I studied,self-guided,\n")
+    backup.write("thought_journal,not a date,I will fail,I studied,self-guided,\n")
+    backup.seek(0)
+
+    with pytest.raises(ValueError, match="^line 3: bad created_at 'not a date'"):
+        journal_io.restore(backup, "csv", "bob", chunk_size=1)
+
+    assert _rows("bob") == []
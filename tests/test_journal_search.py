@@ -0,0 +1,41 @@
+"""Journal search only ever sees the searching user's entries."""
+import sqlite3
+
+import pytest
+
+import database as db
+import migrations
+
+USERS = ["default", "alice", "Alice", "alice smith", "alice-smith", "élodie", ""]
+
+@pytest.fixture
+def journals():
+    for user_id in USERS:
+        db.save_thought_entry(f"My exam worries {user_id}", "I prepared well", "self-guided",
+                              user_id)
+
+def test_search_finds_only_the_users_own_entries(journals):
+    for user_id in USERS:
+        entries, _ = db.search_thought_entries("exam worr", user_id=user_id)
+        assert [entry["original"] for entry in entries] == [f"My exam worries {user_id}"]
+
+def test_owner_tokens_are_not_matched_as_words(journals):
+    owner = "alice".encode("utf-8").hex()
+    assert db.search_thought_entries(owner[:4], user_id="alice") == ([], None)
+
+def test_upgrading_indexes_existing_entries_by_owner(tmp_path, monkeypatch):
+    path = str(tmp_path / "v6.db")
+    conn = sqlite3.connect(path)
+    for number, migration in enumerate(migrations.MIGRATIONS[:6], start=1):
+        migration(conn)
+        conn.execute(f"PRAGMA user_version = {number}")
+    conn.execute("INSERT INTO thought_journal (user_id, original_thought, reframed_thought, "
+                 "reframing_method) VALUES ('alice', 'An old exam', 'Fine', 'self-guided')")
+    conn.commit()
+    conn.close()
+
+    db.close_pool()
+    monkeypatch.setattr(db, "DB_PATH", path)
+    assert [entry["original"] for entry in db.search_thought_entries("exam", user_id="alice")[0]] \
+        == ["An old exam"]
+    assert db.search_thought_entries("exam", user_id="bob") == ([], None)
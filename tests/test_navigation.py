@@ -0,0 +1,46 @@
+"""Every navigation click costs exactly one run of app.py.
+
+Clicks every sidebar navigation button from every page, plus the home
+page's buttons that lead to an exercise, under
+``streamlit.testing.v1.AppTest`` and counts the script executions each
+click causes.
+"""
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+PAGES = ['home', 'breathing', 'grounding', 'reframing', 'journal']
+
+# Buttons on the home page that navigate, and the page they lead to
+HOME_BUTTONS = {
+    'btn_breathing': 'breathing',
+    'btn_grounding': 'grounding',
+    'btn_reframing': 'reframing',
+}
+
+CLICKS = [(page, f"nav_{target}", target)
+          for page in PAGES for target in PAGES if target != page]
+CLICKS += [('home', key, target) for key, target in HOME_BUTTONS.items()]
+
+def counted_script(code, runs):
+    """Run app.py's compiled code as the script, counting the executions."""
+    runs.append(1)
+    exec(code, {'__name__': '__main__'})
+
+@pytest.mark.parametrize("page, key, target", CLICKS)
+def test_click_takes_one_run_to_its_page(app_dir, page, key, target):
+    path = os.path.join(app_dir, 'app.py')
+    with open(path) as f:
+        code = compile(f.read(), path, 'exec')
+    runs = []
+    at = AppTest.from_function(counted_script, args=(code, runs), default_timeout=60)
+    at.session_state.current_page = page
+    at.run()
+    del runs[:]
+
+    at.button(key=key).click().run()
+
+    assert not at.exception
+    assert len(runs) == 1
+    assert at.session_state.current_page == target
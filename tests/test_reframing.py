@@ -0,0 +1,15 @@
+"""A fresh reframing is asked of the API even when one is cached."""
+import ai_helper
+from conftest import REPLY
+
+THOUGHT = "Everyone noticed my mistake"
+
+def test_fresh_reframing_skips_the_response_cache(completions):
+    completions.delay = 0
+    assert ai_helper.generate_thought_reframing(THOUGHT) == REPLY
+
+    assert "".join(ai_helper.stream_thought_reframing(THOUGHT)).strip() == REPLY
+    assert completions.calls == 1
+
+    assert "".join(ai_helper.stream_thought_reframing(THOUGHT, fresh=True)).strip() == REPLY
+    assert completions.calls == 2
@@ -0,0 +1,49 @@
+"""Reruns that only change what was typed do not touch the database.
+
+Opens every page under ``streamlit.testing.v1.AppTest`` against a database
+holding a few journal entries and today's message, then types into the
+page's text areas, one rerun per keystroke, counting the pooled
+connections each rerun borrows.
+"""
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import database as db
+
+PAGES = ['home', 'breathing', 'grounding', 'reframing', 'journal']
+
+TYPED = ["I", "I am", "I am worried", "I am worried about", "I am worried about my exam"]
+
+@pytest.fixture
+def counts(monkeypatch):
+    """Count every ``database.pooled_connection()`` call."""
+    for i in range(30):
+        db.save_thought_entry(f"Thought {i}", f"Reframed {i}", "self-guided")
+    db.save_daily_message("Today's message")
+
+    counts = []
+    pooled_connection = db.pooled_connection
+
+    def counted():
+        counts.append(1)
+        return pooled_connection()
+
+    monkeypatch.setattr(db, "pooled_connection", counted)
+    return counts
+
+@pytest.mark.parametrize("page", PAGES)
+def test_typing_makes_no_queries(app_dir, counts, page):
+    at = AppTest.from_file(os.path.join(app_dir, 'app.py'), default_timeout=60)
+    at.session_state.current_page = page
+    at.run()
+    assert not at.exception
+
+    for text in TYPED:
+        del counts[:]
+        for text_area in at.text_area:
+            text_area.input(text)
+        at.run()
+        assert not at.exception
+        assert len(counts) == 0, f"typing {text!r} borrowed {len(counts)} connection(s)"
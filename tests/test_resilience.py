@@ -0,0 +1,87 @@
+"""The circuit breaker and the retry loop count every failure once."""
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+import ai_helper
+import resilience
+
+class CountingBreaker(resilience.CircuitBreaker):
+    """A breaker that never opens and counts the failures recorded."""
+
+    def __init__(self):
+        super().__init__(failure_threshold=1000)
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        super().record_failure()
+
+def _server_error():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return openai.InternalServerError("Injected failure", response=httpx.Response(500, request=request),
+                                      body=None)
+
+def test_breaker_opens_at_the_threshold():
+    breaker = resilience.CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == breaker.CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert not breaker.allow()
+
+def test_abandoned_trial_reopens_the_breaker_until_the_next_recovery_timeout():
+    breaker = resilience.CircuitBreaker(failure_threshold=1, recovery_timeout=0.1)
+    breaker.record_failure()
+    time.sleep(0.1)
+
+    async def trial(timeout):
+        await asyncio.sleep(10)
+
+    async def cancelled_trial():
+        task = asyncio.ensure_future(resilience.acall_with_retry(trial, breaker, deadline=5))
+        await asyncio.sleep(0.01)
+        assert breaker.state == breaker.HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelled_trial())
+    assert breaker.state == breaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.1)
+    assert breaker.allow()
+    assert breaker.state == breaker.HALF_OPEN
+
+def test_trial_that_never_reports_back_is_replaced_after_the_recovery_timeout():
+    breaker = resilience.CircuitBreaker(failure_threshold=1, recovery_timeout=0.1)
+    breaker.record_failure()
+    time.sleep(0.1)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    time.sleep(0.1)
+    assert breaker.allow()
+
+def test_streamed_call_records_each_failed_attempt_once(completions, monkeypatch):
+    breaker = CountingBreaker()
+    monkeypatch.setattr(ai_helper, "breaker", breaker)
+    monkeypatch.setattr(resilience, "backoff_delay", lambda *args: 0)
+
+    def create(**kwargs):
+        completions._count()
+        raise _server_error()
+
+    monkeypatch.setattr(completions, "create", create)
+
+    text = "".join(ai_helper.stream_thought_reframing("My code will never work"))
+
+    assert text  # the local fallback
+    assert completions.calls == ai_helper.MAX_ATTEMPTS == 3
+    assert breaker.failures == 3
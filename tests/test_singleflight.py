@@ -0,0 +1,97 @@
+"""Concurrent identical AI requests share one upstream call."""
+import asyncio
+import threading
+import time
+
+import ai_helper
+from conftest import REPLY
+
+CALLERS = 100
+
+def _assert_one_billed_call():
+    entries = list(ai_helper.latency_log)[-CALLERS:]
+    billed = [entry for entry in entries if not entry["coalesced"]]
+    assert len(billed) == 1 and billed[0]["prompt_tokens"] == 10
+    assert all(entry["prompt_tokens"] == 0 for entry in entries if entry["coalesced"])
+
+def test_concurrent_sync_calls_make_one_upstream_request(completions):
+    barrier = threading.Barrier(CALLERS)
+    results = [None] * CALLERS
+
+    def call(i):
+        barrier.wait()
+        results[i] = ai_helper.generate_thought_reframing("I will fail my exam")
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert completions.calls == 1
+    assert results == [REPLY] * CALLERS
+    _assert_one_billed_call()
+
+def test_concurrent_async_calls_make_one_upstream_request(async_completions):
+    async def call_all():
+        return await asyncio.gather(*(ai_helper.agenerate_thought_reframing("I will fail my exam")
+                                      for _ in range(CALLERS)))
+
+    results = ai_helper.run_async(call_all())
+
+    assert async_completions.calls == 1
+    assert results == [REPLY] * CALLERS
+    _assert_one_billed_call()
+
+def test_async_follower_keeps_its_own_deadline(async_completions):
+    async_completions.delay = 1.0
+
+    async def leader_and_follower():
+        leader = asyncio.ensure_future(ai_helper.agenerate_thought_reframing("Nobody likes me"))
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        follower = await ai_helper.agenerate_thought_reframing("Nobody likes me", timeout=0.1)
+        waited = time.perf_counter() - started
+        return await leader, follower, waited
+
+    leader, follower, waited = ai_helper.run_async(leader_and_follower())
+
+    assert async_completions.calls == 1
+    # The follower gave up at its deadline; the shared call carried on
+    assert waited < 0.5
+    assert follower != leader
+    assert leader == REPLY
+    assert ai_helper.latency_log[-1]["coalesced"] is False
+
+def test_closing_a_streaming_leader_hands_the_call_to_its_follower(completions):
+    completions.delay = 0.1
+    leader = ai_helper.stream_thought_reframing("I said something silly")
+    next(leader)
+
+    results = []
+    follower = threading.Thread(
+        target=lambda: results.append(ai_helper.generate_thought_reframing("I said something silly")))
+    follower.start()
+    time.sleep(0.05)
+    # What a Streamlit rerun does to the page that was streaming
+    leader.close()
+    follower.join()
+
+    assert results == [REPLY]
+    assert completions.calls == 2
+
+def test_cancelling_an_async_leader_hands_the_call_to_its_follower(async_completions):
+    async def leader_and_follower():
+        leader = asyncio.ensure_future(ai_helper.agenerate_thought_reframing("I said something silly"))
+        await asyncio.sleep(0.05)
+        follower = asyncio.ensure_future(
+            ai_helper.agenerate_thought_reframing("I said something silly"))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        return await follower, await asyncio.gather(leader, return_exceptions=True)
+
+    follower, (leader,) = ai_helper.run_async(leader_and_follower())
+
+    assert follower == REPLY
+    assert isinstance(leader, asyncio.CancelledError)
+    assert async_completions.calls == 2
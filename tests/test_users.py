@@ -0,0 +1,13 @@
+"""Looking a user up never creates them; saving preferences does."""
+import database as db
+
+def test_unknown_users_read_the_defaults_without_being_created():
+    assert db.get_user_preferences("made-up") == db.DEFAULT_PREFERENCES
+    assert db.get_user_ids() == [db.DEFAULT_USER_ID]
+
+def test_saving_preferences_creates_the_user():
+    db.save_user_preferences("Bean", "alice")
+    db.save_user_preferences("Beanie", "alice")
+
+    assert db.get_user_preferences("alice")["nickname"] == "Beanie"
+    assert db.get_user_ids() == ["alice", db.DEFAULT_USER_ID]
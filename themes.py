@@ -0,0 +1,427 @@
+import os
+import re
+import sys
+import zlib
+import hashlib
+import logging
+import argparse
+import functools
+import threading
+import numpy as np
+import database as db
+
+logger = logging.getLogger(__name__)
+
+# Recurring themes in the thought journal, found without calling the AI.
+#
+# The original thought of every entry is turned into a hashed term-count
+# vector once, when the entry is first seen: each word is hashed into one of
+# HASH_DIM buckets, so there is no vocabulary to maintain. A user's vectors
+# are stored sparsely, as NumPy arrays in a .npz file next to the database,
+# and each update only vectorizes the entries added since the last one.
+# Finding themes weights the counts by TF-IDF and groups similar entries with
+# spherical k-means (cosine similarity), all as whole-array operations. The
+# same vectors serve as a nearest-neighbour index: find_similar_entries()
+# finds the past entries closest to a new thought.
+#
+# Run it from the command line to update a user's vectors and print the
+# themes:
+#
+#     python themes.py --user default
+
+HASH_DIM = 2 ** 14
+NUM_THEMES = int(os.environ.get("JOURNAL_THEMES", 8))
+KMEANS_ITERATIONS = 15
+
+# Smaller clusters are not reported as themes
+MIN_THEME_SIZE = 3
+
+# Words shown per theme and example entries kept per theme
+THEME_TERMS = 3
+THEME_EXAMPLES = 3
+
+# Vectors are stored in this directory next to the database file
+VECTORS_DIR = 'journal_vectors'
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been
+before being below between both but by can can't cannot could couldn't did didn't do does
+doesn't doing don't down during each even ever every feel feeling few for from further get
+gets getting go going gonna got had hadn't has hasn't have haven't having he her here hers
+herself him himself his how i i'd i'll i'm i've if in into is isn't it it's its itself just
+keep know like lot make many maybe me more most much must my myself never no nor not now of
+off on once one only or other our ours ourselves out over own really same she should
+shouldn't so some still such than that that's the their theirs them themselves then there
+these they thing things think this those through to too under until up very was wasn't way
+we were weren't what when where which while who whom why will with won't would wouldn't you
+your yours yourself
+""".split())
+
+# A negation is bound to the word after it ("can't handle" becomes
+# "not_handle"), so a thought and its opposite do not look alike. Words in
+# between that only add emphasis are skipped.
+NEGATIONS = frozenset(["not", "no", "never", "nor", "cannot", "nothing", "nobody", "nowhere"])
+NEGATION_SKIP = frozenset(["really", "even", "ever", "just", "actually", "always", "very",
+                           "too", "so", "quite", "that", "at", "all", "a", "the"])
+
+# Bumped when tokenize() changes, so stored vectors are rebuilt
+TOKENIZER_VERSION = 2
+
+_WORD = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+def _is_negation(word):
+    return word in NEGATIONS or word.endswith("n't")
+
+def tokenize(text):
+    """Split a thought into the words that carry its meaning.
+
+    Args:
+        text (str): A journal entry's text
+
+    Returns:
+        list: Lower-case words, without stop words and words under 3 letters;
+        a negated word is prefixed with ``not_``, stop word or not
+    """
+    tokens = []
+    negated = False
+    for word in _WORD.findall(text.lower().replace("\u2019", "'")):
+        if _is_negation(word):
+            negated = True
+        elif negated and word not in NEGATION_SKIP:
+            tokens.append(f"not_{word}")
+            negated = False
+        elif len(word) > 2 and word not in STOP_WORDS:
+            tokens.append(word)
+    if negated:
+        tokens.append("not")
+    return tokens
+
+@functools.lru_cache(maxsize=65536)
+def _bucket(word):
+    # crc32 rather than hash(), which differs between processes
+    return zlib.crc32(word.encode('utf-8')) % HASH_DIM
+
+class JournalVectors:
+    """Hashed term counts of one user's journal entries, one sparse row per entry.
+
+    Row ``i`` belongs to the entry ``ids[i]``; its buckets and counts are
+    ``indices[indptr[i]:indptr[i + 1]]`` and ``counts[...]`` (the CSR layout).
+    ``vocabulary`` remembers a word for every bucket, to name the themes.
+    """
+
+    def __init__(self, ids=None, indptr=None, indices=None, counts=None, vocabulary=None):
+        self.ids = np.zeros(0, np.int64) if ids is None else ids
+        self.indptr = np.zeros(1, np.int64) if indptr is None else indptr
+        self.indices = np.zeros(0, np.uint16) if indices is None else indices
+        self.counts = np.zeros(0, np.float32) if counts is None else counts
+        self.vocabulary = {} if vocabulary is None else vocabulary
+
+    def __len__(self):
+        return len(self.ids)
+
+    def copy(self):
+        """A snapshot that later updates of these vectors do not change."""
+        return JournalVectors(self.ids, self.indptr, self.indices, self.counts,
+                              dict(self.vocabulary))
+
+    @classmethod
+    def load(cls, path):
+        """Load vectors saved with ``save()``, or return empty ones if there are none."""
+        try:
+            with np.load(path) as data:
+                vocabulary = dict(zip(data['vocabulary_buckets'].tolist(),
+                                      data['vocabulary_words'].tolist()))
+                if ('tokenizer_version' not in data.files
+                        or int(data['tokenizer_version']) != TOKENIZER_VERSION):
+                    # Made with another tokenizer; start over
+                    return cls()
+                return cls(data['ids'], data['indptr'], data['indices'], data['counts'],
+                           vocabulary)
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, path):
+        """Write the vectors to a .npz file, replacing it atomically."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        buckets = sorted(self.vocabulary)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            np.savez(f, ids=self.ids, indptr=self.indptr, indices=self.indices,
+                     counts=self.counts, tokenizer_version=np.array(TOKENIZER_VERSION),
+                     vocabulary_buckets=np.array(buckets, np.uint16),
+                     vocabulary_words=np.array([self.vocabulary[b] for b in buckets], str))
+        os.replace(temporary, path)
+
+    def add(self, entries):
+        """Vectorize entries and append them.
+
+        Args:
+            entries (list): ``(id, text)`` pairs of entries not added before
+        """
+        if not entries:
+            return
+        ids, lengths, indices, counts = [], [], [], []
+        vocabulary = self.vocabulary
+        for entry_id, text in entries:
+            row = {}
+            for word in tokenize(text):
+                bucket = _bucket(word)
+                row[bucket] = row.get(bucket, 0) + 1
+                vocabulary.setdefault(bucket, word.replace('_', ' '))
+            ids.append(entry_id)
+            lengths.append(len(row))
+            indices.extend(row)
+            counts.extend(row.values())
+
+        self.ids = np.concatenate([self.ids, np.array(ids, np.int64)])
+        self.indptr = np.concatenate([self.indptr, self.indptr[-1] + np.cumsum(lengths, dtype=np.int64)])
+        self.indices = np.concatenate([self.indices, np.array(indices, np.uint16)])
+        self.counts = np.concatenate([self.counts, np.array(counts, np.float32)])
+
+    def keep(self, ids):
+        """Drop the rows of entries that are not in ``ids`` (deleted entries)."""
+        mask = np.isin(self.ids, ids)
+        if mask.all():
+            return
+        lengths = np.diff(self.indptr)
+        kept = np.repeat(mask, lengths)
+        self.ids = self.ids[mask]
+        self.indptr = np.concatenate([[0], np.cumsum(lengths[mask])]).astype(np.int64)
+        self.indices = self.indices[kept]
+        self.counts = self.counts[kept]
+
+def vectors_path(user_id=db.DEFAULT_USER_ID):
+    """Return where a user's vectors are stored.
+
+    User IDs come from the URL, so the file is named after a hash of it.
+    """
+    name = hashlib.sha256(user_id.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(os.path.dirname(db.DB_PATH) or '.', VECTORS_DIR, f"{name}.npz")
+
+# Vectors already loaded by this process, by file
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+def update_vectors(user_id=db.DEFAULT_USER_ID):
+    """Bring a user's stored vectors up to date with their journal.
+
+    Only entries that are not stored yet are read and vectorized, and rows
+    of deleted entries are dropped.
+
+    Args:
+        user_id (str): The user whose journal to vectorize
+
+    Returns:
+        JournalVectors: The user's up-to-date vectors
+    """
+    path = vectors_path(user_id)
+    with _loaded_lock:
+        vectors = _loaded.get(path)
+        if vectors is None:
+            vectors = _loaded[path] = JournalVectors.load(path)
+
+        last_id = int(vectors.ids.max()) if len(vectors) else 0
+        entries, journal_last_id = db.count_thought_entries(user_id)
+        if entries == len(vectors) and journal_last_id == last_id:
+            return vectors.copy()
+
+        # Usually entries were only added, and they are the ones after the last
+        vectors.add(db.get_thought_texts_since(last_id, user_id))
+        if entries != len(vectors):
+            # Entries were deleted too, or committed out of ID order
+            ids = np.array(db.get_thought_entry_ids(user_id), np.int64)
+            vectors.keep(ids)
+            missing = ids[~np.isin(ids, vectors.ids)]
+            if len(missing):
+                wanted = set(missing.tolist())
+                vectors.add([entry for entry in db.get_thought_texts_since(int(missing[0]) - 1, user_id)
+                             if entry[0] in wanted])
+        try:
+            vectors.save(path)
+        except OSError:
+            # Still up to date in memory; the next process starts over
+            logger.warning("Could not save the journal vectors to %s", path, exc_info=True)
+        logger.info("Journal vectors of %s updated to %d entries", user_id, len(vectors))
+        return vectors.copy()
+
+def _idf(indices, documents):
+    document_frequency = np.bincount(indices, minlength=HASH_DIM)
+    return (np.log((1 + documents) / (1 + document_frequency)) + 1).astype(np.float32)
+
+def _tfidf(vectors):
+    """Weight the counts by TF-IDF and normalize every row to unit length.
+
+    Returns:
+        tuple: ``(rows, starts, indices, values)`` for the rows with at least
+        one word: their positions in ``vectors``, where each begins in
+        ``indices``/``values``, and the weighted, normalized entries
+    """
+    lengths = np.diff(vectors.indptr)
+    rows = np.flatnonzero(lengths)
+    # Empty rows take up no entries, so the others still start at indptr
+    starts = vectors.indptr[rows]
+    indices = vectors.indices.astype(np.intp)
+    if len(rows) == 0:
+        return rows, starts, indices, vectors.counts
+
+    values = (1 + np.log(vectors.counts)) * _idf(indices, len(rows))[indices]
+    values /= np.repeat(np.sqrt(np.add.reduceat(values * values, starts)), lengths[rows])
+    return rows, starts, indices, values
+
+def _similarities(starts, indices, values, centroids):
+    """Cosine similarity of every row with every centroid, as a rows x centroids array."""
+    weighted = np.ascontiguousarray(centroids.T)[indices] * values[:, None]
+    return np.add.reduceat(weighted, starts, axis=0)
+
+def _centroids(labels, starts, indices, values, count):
+    """Mean direction of each cluster's rows, normalized to unit length."""
+    lengths = np.diff(np.append(starts, len(indices)))
+    flat = np.repeat(labels, lengths) * HASH_DIM + indices
+    sums = np.bincount(flat, weights=values, minlength=count * HASH_DIM)
+    centroids = sums.reshape(count, HASH_DIM).astype(np.float32)
+    norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+    return centroids / np.where(norms > 0, norms, 1)
+
+def _row(position, starts, indices, values):
+    """One row as a dense vector."""
+    end = starts[position + 1] if position + 1 < len(starts) else len(indices)
+    row = np.zeros(HASH_DIM, np.float32)
+    row[indices[starts[position]:end]] = values[starts[position]:end]
+    return row
+
+def find_themes(vectors, count=NUM_THEMES, seed=0):
+    """Cluster journal entries by the words they use.
+
+    Args:
+        vectors (JournalVectors): A user's vectors, see ``update_vectors()``
+        count (int): How many clusters to look for
+        seed (int): Seed of the cluster initialization, for repeatable results
+
+    Returns:
+        list: One dictionary per theme, largest first, with the theme's
+        ``terms``, its number of ``entries``, the IDs of the ``examples``
+        closest to its center and its ``cohesion`` (mean cosine similarity
+        of its entries to the center, from 0 to 1)
+    """
+    rows, starts, indices, values = _tfidf(vectors)
+    count = min(count, len(rows) // MIN_THEME_SIZE)
+    if count < 1:
+        return []
+
+    # k-means++ initialization: each new center is picked with a probability
+    # growing with the distance to the centers picked so far
+    rng = np.random.default_rng(seed)
+    centroids = np.zeros((count, HASH_DIM), np.float32)
+    closest = np.zeros(len(rows), np.float32)
+    for k in range(count):
+        if k == 0:
+            position = rng.integers(len(rows))
+        else:
+            distance = np.maximum(1 - closest, 0).astype(np.float64) ** 2
+            total = distance.sum()
+            if total <= 0:
+                count = k
+                centroids = centroids[:k]
+                break
+            position = rng.choice(len(rows), p=distance / total)
+        centroids[k] = _row(position, starts, indices, values)
+        closest = np.maximum(closest, _similarities(starts, indices, values, centroids[k:k + 1])[:, 0])
+
+    labels = None
+    for _ in range(KMEANS_ITERATIONS):
+        similarities = _similarities(starts, indices, values, centroids)
+        new_labels = similarities.argmax(axis=1)
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        centroids = _centroids(labels, starts, indices, values, count)
+    else:
+        similarities = _similarities(starts, indices, values, centroids)
+        labels = similarities.argmax(axis=1)
+
+    best = similarities[np.arange(len(rows)), labels]
+    sizes = np.bincount(labels, minlength=count)
+    cohesion = np.bincount(labels, weights=best, minlength=count) / np.maximum(sizes, 1)
+
+    themes = []
+    for k in np.argsort(-sizes, kind='stable'):
+        if sizes[k] < MIN_THEME_SIZE:
+            continue
+        members = np.flatnonzero(labels == k)
+        examples = members[np.argsort(-best[members])[:THEME_EXAMPLES]]
+        top = np.argsort(-centroids[k])[:THEME_TERMS]
+        themes.append({
+            'terms': [vectors.vocabulary[b] for b in top.tolist()
+                      if centroids[k, b] > 0 and b in vectors.vocabulary],
+            'entries': int(sizes[k]),
+            'examples': vectors.ids[rows[examples]].tolist(),
+            'cohesion': float(cohesion[k]),
+        })
+    return themes
+
+def find_similar_entries(vectors, text, count=1):
+    """Find the entries whose words are closest to a piece of text.
+
+    Args:
+        vectors (JournalVectors): A user's vectors, see ``update_vectors()``
+        text (str): The new thought
+        count (int): How many entries to return at most
+
+    Returns:
+        list: ``(entry_id, similarity)`` pairs, most similar first, the
+        similarity being the cosine of the TF-IDF vectors, from 0 to 1
+    """
+    query = {}
+    for word in tokenize(text):
+        bucket = _bucket(word)
+        query[bucket] = query.get(bucket, 0) + 1
+    rows, starts, indices, values = _tfidf(vectors)
+    if not query or len(rows) == 0:
+        return []
+
+    # The query is weighted like the entries, with the journal's IDF
+    buckets = np.fromiter(query, np.intp, len(query))
+    weights = np.zeros(HASH_DIM, np.float32)
+    counts = np.fromiter(query.values(), np.float32, len(query))
+    weights[buckets] = (1 + np.log(counts)) * _idf(indices, len(rows))[buckets]
+    weights /= np.linalg.norm(weights)
+
+    # Only the entries sharing a bucket with the query contribute
+    matching = np.flatnonzero(weights[indices])
+    lengths = np.diff(np.append(starts, len(indices)))
+    owners = np.repeat(np.arange(len(rows)), lengths)[matching]
+    similarities = np.bincount(owners, weights=values[matching] * weights[indices[matching]],
+                               minlength=len(rows))
+
+    best = np.argpartition(-similarities, count - 1)[:count] if count < len(rows) else np.arange(len(rows))
+    best = best[np.argsort(-similarities[best], kind='stable')]
+    return [(int(vectors.ids[rows[i]]), float(similarities[i])) for i in best if similarities[i] > 0]
+
+def get_top_themes(count=5, user_id=db.DEFAULT_USER_ID):
+    """Get the most common recurring themes in a user's journal.
+
+    Args:
+        count (int): How many themes to return at most
+        user_id (str): The user whose journal to analyze
+
+    Returns:
+        list: Themes as returned by ``find_themes()``
+    """
+    return find_themes(update_vectors(user_id))[:count]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find recurring themes in the thought journal.")
+    parser.add_argument("--user", default=db.DEFAULT_USER_ID,
+                        help="the user whose journal to analyze")
+    parser.add_argument("--count", type=int, default=NUM_THEMES,
+                        help="how many themes to show at most")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    for theme in get_top_themes(args.count, args.user):
+        print(f"{', '.join(theme['terms']):<40} {theme['entries']:>6} entries "
+              f"(cohesion {theme['cohesion']:.2f})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import importlib
+import streamlit as st
+
+# Page router for app.py.
+#
+# Each page lives in its own module under views/ with a render() function.
+# Only the module of the page being shown is imported, so a page never pays
+# for another page's imports (e.g. the AI client on the breathing page).
+
+# Route -> module rendering that page
+PAGES = {
+    'home': 'views.home',
+    'breathing': 'views.breathing',
+    'grounding': 'views.grounding',
+    'reframing': 'views.reframing',
+    'journal': 'views.journal',
+}
+
+DEFAULT_PAGE = 'home'
+
+def navigate_to(page):
+    """Switch to another page; use as a button's ``on_click`` callback.
+
+    Streamlit already reruns the script once after a callback, so this only
+    records the new page and that single rerun renders it.
+
+    Args:
+        page (str): A route in ``PAGES``
+    """
+    st.session_state.current_page = page
+
+def render(page):
+    """Import the module for a page, if needed, and render it.
+
+    Args:
+        page (str): A route in ``PAGES``; unknown routes show the home page
+    """
+    module = importlib.import_module(PAGES.get(page, PAGES[DEFAULT_PAGE]))
+    module.render()
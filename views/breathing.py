@@ -0,0 +1,87 @@
+import streamlit as st
+import math
+import time
+from utils import get_breathing_instructions
+
+# Breathing exercise page
+
+# Fragments rerun on their own instead of the whole script; only newer
+# Streamlit versions have them
+streamlit_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+# How often the auto-advancing breathing exercise updates, in seconds
+BREATHING_TICK_SECONDS = 1
+
+# Move the breathing exercise on to its next step
+def next_breath():
+    st.session_state.breathing_count = (st.session_state.breathing_count + 1) % 3
+    st.session_state.breathing_step_started = time.time()
+
+# Start the current breathing step over, e.g. when the timer is switched on
+def restart_breath():
+    st.session_state.breathing_step_started = time.time()
+
+# The breathing exercise itself. Run as a fragment, its button and timer
+# ticks only re-render this widget rather than the whole page.
+def breathing_exercise(auto_advance):
+    instruction, duration = get_breathing_instructions(st.session_state.breathing_count)
+    elapsed = 0
+    
+    if auto_advance:
+        # Advance through every step whose time is up, keeping the schedule
+        # anchored to when the step started rather than to the tick
+        elapsed = time.time() - st.session_state.breathing_step_started
+        while elapsed >= duration:
+            st.session_state.breathing_count = (st.session_state.breathing_count + 1) % 3
+            st.session_state.breathing_step_started += duration
+            elapsed -= duration
+            instruction, duration = get_breathing_instructions(st.session_state.breathing_count)
+    
+    # Create a large display for the current instruction
+    st.markdown(f"## {instruction}")
+    
+    # Progress bar to visualize the breathing cycle
+    progress_bar = st.progress(int(100 * elapsed / duration))
+    
+    # Using st.empty() to create placeholders for updating elements
+    message_placeholder = st.empty()
+    if auto_advance:
+        message_placeholder.markdown(f"*{math.ceil(duration - elapsed)} of {duration} seconds left*")
+    
+    # Button to manually advance through the breathing cycle
+    st.button("Next Breath", on_click=next_breath)
+
+def render():
+    st.title("Breathing Exercise")
+    
+    st.markdown("""
+    ### 4-7-8 Breathing Technique
+    
+    Let those beautiful hazel eyes close for a moment, Boops. This breathing technique
+    will help calm your nervous system when your mind is racing too fast.
+    """)
+    
+    if streamlit_fragment is not None:
+        # Let the exercise keep time by itself, using the 4/7/8 second steps
+        auto_advance = st.checkbox("Guide me with a timer", key="breathing_auto",
+                                   on_change=restart_breath)
+        run_every = BREATHING_TICK_SECONDS if auto_advance else None
+        streamlit_fragment(run_every=run_every)(breathing_exercise)(auto_advance)
+    else:
+        # Older Streamlit reruns the whole page on every click
+        breathing_exercise(False)
+    
+    # Add a note about us
+    st.info("Remember when we watched The Night Agent together and you said the suspense was making your heart race? This breathing exercise helps with exactly that feeling! 💕")
+    
+    st.markdown("""
+    #### Benefits of Deep Breathing:
+    
+    * Reduces stress and anxiety
+    * Lowers heart rate and blood pressure
+    * Helps clear your mind - even after staying up too late (you night owl! 🦉)
+    * Improves focus and concentration
+    
+    Try to complete at least 4 full cycles (inhale, hold, exhale) for maximum benefit.
+    Then maybe have a Kinder Joy? Everything's better with chocolate 🍫
+    """)
@@ -0,0 +1,56 @@
+import streamlit as st
+from exercises import get_grounding_exercise
+
+# Grounding exercise page
+
+def render():
+    st.title("Grounding Exercise")
+    
+    st.markdown("""
+    ### 5-4-3-2-1 Grounding Technique
+    
+    When your mind gets lost in Purdue vs. Penn State debates (we know which is better 😉) or 
+    any other overthinking spirals, this exercise helps bring you back to your cute little 
+    studio in West Lafayette by engaging your five senses.
+    """)
+    
+    # Get the grounding exercise
+    steps = get_grounding_exercise()
+    
+    # Display each step with examples with personal touches
+    st.markdown(f"### {list(steps.keys())[0]}")  # 5 Things You Can See
+    st.markdown(f"{steps[list(steps.keys())[0]]}")
+    st.markdown("*(Maybe Daisy the bunny plushie is one of them? Or that katana you got me?)*")
+    user_input = st.text_area(f"Write what you notice for {list(steps.keys())[0].lower()}", key=list(steps.keys())[0])
+    
+    st.markdown(f"### {list(steps.keys())[1]}")  # 4 Things You Can Touch
+    st.markdown(f"{steps[list(steps.keys())[1]]}")
+    st.markdown("*(Your drawing supplies? The soft fur of Daisy?)*")
+    user_input = st.text_area(f"Write what you notice for {list(steps.keys())[1].lower()}", key=list(steps.keys())[1])
+    
+    st.markdown(f"### {list(steps.keys())[2]}")  # 3 Things You Can Hear
+    st.markdown(f"{steps[list(steps.keys())[2]]}")
+    st.markdown("*(Maybe put on 'ilym' by John K in the background?)*")
+    user_input = st.text_area(f"Write what you notice for {list(steps.keys())[2].lower()}", key=list(steps.keys())[2])
+    
+    st.markdown(f"### {list(steps.keys())[3]}")  # 2 Things You Can Smell
+    st.markdown(f"{steps[list(steps.keys())[3]]}")
+    st.markdown("*(The amazing pasta you make? Though maybe not takoyaki since your Bean is vegetarian 😘)*")
+    user_input = st.text_area(f"Write what you notice for {list(steps.keys())[3].lower()}", key=list(steps.keys())[3])
+    
+    st.markdown(f"### {list(steps.keys())[4]}")  # 1 Thing You Can Taste
+    st.markdown(f"{steps[list(steps.keys())[4]]}")
+    st.markdown("*(Kinder Joy, perhaps?)*")
+    user_input = st.text_area(f"Write what you notice for {list(steps.keys())[4].lower()}", key=list(steps.keys())[4])
+    
+    st.markdown("""
+    ### How does my Boopie feel now?
+    
+    Taking time to notice what's actually around you can help break the cycle of overthinking
+    by anchoring you in the present moment. Remember, one day we'll share that view of the 
+    Eiffel Tower together - sipping wine in bathrobes from our dream balcony in Paris.
+    """)
+    
+    if st.button("I feel more grounded"):
+        st.balloons()
+        st.success("Wonderful, Boops! And remember - our future will have a husky too! 🐺")
@@ -0,0 +1,74 @@
+import streamlit as st
+from ai_helper import generate_custom_affirmation
+import database as db
+import read_cache
+import html_blocks
+from views import navigate_to
+
+# Home page
+
+def render():
+    # Styled header with gradient
+    st.markdown(html_blocks.HOME_HEADER, unsafe_allow_html=True)
+    
+    # Prettier welcome message with card-like styling
+    st.markdown(html_blocks.WELCOME_CARD, unsafe_allow_html=True)
+    
+    # Styled mood selection buttons - adaptable for older Streamlit versions,
+    # prebuilt as a single HTML string with all of them in a row
+    # Display the mood buttons as HTML
+    st.markdown(html_blocks.MOOD_CARDS, unsafe_allow_html=True)
+    
+    # Add the action buttons separately
+    st.markdown(html_blocks.MOOD_ROW_OPEN, unsafe_allow_html=True)
+    for option in html_blocks.MOOD_OPTIONS:
+        if st.button(f"Go to {option['title']}", key=f"btn_{option['route']}", 
+                  on_click=navigate_to, args=(option['route'],)):
+            pass
+    st.markdown(html_blocks.CLOSE_DIV, unsafe_allow_html=True)
+    
+    # Styled divider
+    st.markdown(html_blocks.HOME_DIVIDER, unsafe_allow_html=True)
+    
+    # AI Daily Message with card styling
+    st.markdown(html_blocks.DAILY_MESSAGE_HEADER, unsafe_allow_html=True)
+    
+    # Check for today's message in the database, unless this session already has
+    today_message = read_cache.today_message(read_cache.for_session(st.session_state),
+                                             st.session_state.user_id)
+    
+    # If no message for today, provide option to generate one - older Streamlit compatible
+    if not today_message:
+        if st.button("Get today's special message", key="daily_message_btn"):
+            # Older Streamlit-friendly spinner 
+            spinner_placeholder = st.empty()
+            spinner_placeholder.markdown("Bean is writing something just for you...")
+            
+            # Generate and save it, unless another session already is
+            today_message = db.get_or_create_today_message(generate_custom_affirmation,
+                                                            st.session_state.user_id)
+            
+            # Clear spinner
+            spinner_placeholder.empty()
+    
+    # Display the message if it exists
+    if today_message:
+        st.markdown(html_blocks.today_message_card(today_message), unsafe_allow_html=True)
+    
+    # Creative activity suggestion with card styling
+    st.markdown(html_blocks.COLORING_CARD, unsafe_allow_html=True)
+    
+    # Styled divider
+    st.markdown(html_blocks.HOME_DIVIDER, unsafe_allow_html=True)
+    
+    # Reminders with nicer styling
+    st.markdown(html_blocks.REMINDERS_CARD, unsafe_allow_html=True)
+    
+    # Add direct link to AI advice - compatible with older Streamlit
+    st.markdown(html_blocks.ADVICE_HEADER, unsafe_allow_html=True)
+    
+    # Using HTML to center the button instead of columns
+    st.markdown(html_blocks.CENTERED_ROW_OPEN, unsafe_allow_html=True)
+    if st.button("Get Personalized Advice", on_click=navigate_to, args=('journal',)):
+        pass
+    st.markdown(html_blocks.CLOSE_DIV, unsafe_allow_html=True)
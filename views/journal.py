@@ -0,0 +1,216 @@
+import streamlit as st
+import datetime
+from ai_helper import generate_custom_affirmation, stream_personalized_advice
+import database as db
+import read_cache
+import journal_io
+
+# Thought journal page
+
+# Show one more page of journal entries on the next run
+def load_more_journal_entries():
+    st.session_state.journal_pages += 1
+
+# Start from the first page of results whenever the search changes
+def reset_journal_pages():
+    st.session_state.journal_pages = 1
+
+# Build the backup file once, when asked, rather than on every run
+def prepare_backup():
+    format = st.session_state.journal_backup_format
+    st.session_state.journal_backup = (format, journal_io.export_bytes(format, st.session_state.user_id))
+
+# Labels of the reframing methods in the journal
+METHOD_LABELS = {
+    'self-guided': "💭 Self-Guided",
+    'ai-suggested': "✨ Bean's AI Reframing",
+}
+
+# Weeks shown in the journal statistics chart
+STATS_WEEKS = 12
+
+# Format an entry's date once, when its page is read, not on every rerun
+def add_date_label(entry):
+    entry['date_str'] = datetime.datetime.fromisoformat(entry['created_at']).strftime("%b %d, %Y at %I:%M %p")
+    return entry
+
+def journal_stats():
+    """Show how much and how often the journal has been used.
+    
+    Everything is read from the per-day and per-week rollups, so this costs
+    one row per period no matter how long the journal is.
+    """
+    import pandas as pd
+    
+    cache = read_cache.for_session(st.session_state)
+    user_id = st.session_state.user_id
+    # Rollup periods follow the stored UTC timestamps
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    this_week = today - datetime.timedelta(days=today.weekday())
+    
+    weeks = read_cache.journal_rollups(cache, 'week', user_id=user_id)
+    days = read_cache.journal_rollups(cache, 'day', since=today - datetime.timedelta(days=90),
+                                      user_id=user_id)
+    if not weeks:
+        return
+    
+    by_method = {method: 0 for method in METHOD_LABELS}
+    for week in weeks:
+        by_method[week['method']] = by_method.get(week['method'], 0) + week['entries']
+    entries_this_week = sum(week['entries'] for week in weeks if week['start'] == this_week)
+    
+    # Days in a row with an entry, counting today only once there is one
+    journaled = {day['start'] for day in days}
+    streak = 0
+    day = today if today in journaled else today - datetime.timedelta(days=1)
+    while day in journaled:
+        streak += 1
+        day -= datetime.timedelta(days=1)
+    
+    st.markdown("### Your Patterns")
+    st.markdown(f"""
+    * **{sum(by_method.values())}** thoughts reframed so far: **{by_method['self-guided']}** on your own and **{by_method['ai-suggested']}** with Bean's help
+    * **{entries_this_week}** this week
+    * **{streak}** {'day' if streak == 1 else 'days'} in a row with a journal entry
+    """)
+    
+    # Groups of similar thoughts, found by comparing the words they use
+    recurring = read_cache.journal_themes(cache, user_id=user_id)
+    if recurring:
+        st.markdown("#### What keeps coming up")
+        st.markdown("\n".join(f"* **{', '.join(theme['terms'])}** ({theme['entries']} entries)"
+                               for theme in recurring))
+    
+    # Entries per week for the last few weeks, empty weeks included
+    starts = [this_week - datetime.timedelta(weeks=n) for n in reversed(range(STATS_WEEKS))]
+    chart = pd.DataFrame(0, index=pd.to_datetime(starts), columns=list(METHOD_LABELS.values()))
+    for week in weeks:
+        if week['start'] >= starts[0] and week['method'] in METHOD_LABELS:
+            chart.loc[pd.Timestamp(week['start']), METHOD_LABELS[week['method']]] = week['entries']
+    st.bar_chart(chart)
+
+def journal_backup():
+    """Offer a backup of the journal and daily messages for download.
+    
+    The file is only built when the button is pressed; streaming it from the
+    database keeps that cheap, but the download itself is held in memory.
+    For very large journals ``python journal_io.py export`` writes straight
+    to disk.
+    """
+    with st.expander("Back up your journal"):
+        st.radio("Format", journal_io.FORMATS, key="journal_backup_format",
+                 format_func=lambda format: format.upper())
+        st.button("Prepare backup", key="journal_prepare_backup", on_click=prepare_backup)
+        backup = st.session_state.get("journal_backup")
+        if backup is not None:
+            format, data = backup
+            st.download_button(f"Download {format.upper()} backup", data,
+                               file_name=f"journal_backup.{format}",
+                               mime=journal_io.MIME_TYPES[format])
+
+def render():
+    st.title("Boopie's Thought Journal")
+    
+    st.markdown(f"""
+    ### Your Beautiful Mind's Journey
+    
+    Just like we're on our journey together (since June 27, 2024!), 
+    these are the thoughts you've been working on reframing. Looking back at these
+    can show how much your perspective has grown.
+    """)
+    
+    # Add an AI-generated affirmation - no container needed for older Streamlit
+    st.markdown("#### Today's special message from Bean:")
+    if st.button("Get a personalized message", key="get_affirmation"):
+        # Older Streamlit-friendly spinner
+        spinner_placeholder = st.empty()
+        spinner_placeholder.markdown("Bean is writing something special for you...")
+        
+        custom_affirmation = generate_custom_affirmation()
+        # Save the affirmation to the database
+        db.queue_daily_message(custom_affirmation, st.session_state.user_id)
+        
+        # Clear spinner and show success
+        spinner_placeholder.empty()
+        st.success(custom_affirmation)
+    
+    st.markdown("---")
+    
+    search_query = st.text_input("Search your journal",
+                                 placeholder="Example: presentation",
+                                 key="journal_search",
+                                 on_change=reset_journal_pages)
+    
+    # Load entries from database one page at a time, best matches first when
+    # searching and newest first otherwise. Pages already read by this
+    # session are reused until the journal changes.
+    cache = read_cache.for_session(st.session_state)
+    entries = []
+    cursor = None
+    for _ in range(st.session_state.journal_pages):
+        if search_query.strip():
+            page, cursor = read_cache.search_thought_entries(cache, search_query, offset=cursor or 0,
+                                                             user_id=st.session_state.user_id,
+                                                             format_entry=add_date_label)
+        else:
+            page, cursor = read_cache.thought_entries_page(cache, cursor=cursor,
+                                                           user_id=st.session_state.user_id,
+                                                           format_entry=add_date_label)
+        entries.extend(page)
+        if cursor is None:
+            break
+    
+    if not entries and search_query.strip():
+        st.info("No journal entries match your search. Try different words, Boopie! 💕")
+    elif not entries:
+        st.info("Your journal is empty. Visit the Thought Reframing page to add entries. Just like we've been dreaming of our future husky, we can fill this page with positive thoughts! 🐺")
+    else:
+        if not search_query.strip():
+            journal_stats()
+        
+        st.markdown("### Your Journal Entries")
+        for i, entry in enumerate(entries):
+            method_label = METHOD_LABELS.get(entry['method'], METHOD_LABELS['ai-suggested'])
+            with st.expander(f"Journal Entry {i+1} - {entry['date_str']} - {method_label}"):
+                st.markdown("**Original thought:**")
+                st.markdown(f"*{entry['original']}*")
+                st.markdown("**Reframed thought:**")
+                st.markdown(f"*{entry['reframed']}*")
+        
+        # Only offer more entries if there are any left
+        if cursor is not None:
+            st.button("Load more entries", key="journal_load_more", on_click=load_more_journal_entries)
+    
+    journal_backup()
+    
+    # Add a section for personalized advice
+    st.markdown("---")
+    st.markdown("### Need advice on something specific?")
+    st.write("I'm here to help with any particular situation you're facing, Boopie.")
+    
+    specific_situation = st.text_area("What's on your mind?", 
+                                     placeholder="Example: I'm feeling nervous about my upcoming presentation...")
+    
+    if specific_situation:
+        if st.button("Get Bean's advice", key="get_advice"):
+            # Older Streamlit-friendly spinner
+            spinner_placeholder = st.empty()
+            spinner_placeholder.markdown("Bean is thinking of the best advice for you...")
+            
+            # Replace the spinner with the advice as it streams in
+            personalized_advice = ""
+            for piece in stream_personalized_advice(specific_situation):
+                personalized_advice += piece
+                spinner_placeholder.info(personalized_advice)
+    
+    st.markdown("---")
+    st.markdown("""
+    ### Looking at your journal helps you:
+    
+    * See patterns in your overthinking (like how cute your nose is, no matter what you think 😉)
+    * Remember that you're stronger than trypophobia or any other fear we share
+    * Track your growth as you handle challenges
+    * Realize you have the wisdom to transform anxious thoughts into peaceful ones
+    
+    One day I'll buy you that Birkin we talk about, but for now, I hope this helps carry your thoughts in a beautiful way. 👜✨
+    """)
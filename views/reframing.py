@@ -0,0 +1,97 @@
+import streamlit as st
+from exercises import get_overthinking_questions, get_reframing_exercise
+from ai_helper import stream_thought_reframing, record_declined_reuse
+import database as db
+import read_cache
+
+# Thought reframing page
+
+def render():
+    st.title("Thought Reframing for My Boopie")
+    
+    st.markdown("""
+    ### Challenge Your Overthinking
+    
+    Those beautiful thoughts in your mind sometimes get tangled up in ways that 
+    aren't quite true - just like when you worry if you're eating enough (you're not 😉).
+    
+    Let your Bean help you reframe these thoughts into something more true and kind.
+    """)
+    
+    # Get overthinking reframing exercise
+    questions = get_overthinking_questions()
+    
+    # Add some Lord of the Rings reference
+    st.info("As they say in Lord of the Rings: 'Not all those who wander are lost.' And not all thoughts that wander into your mind are true! 🧙‍♂️")
+    
+    # Current thought input
+    current_thought = st.text_area("What thought is my Boopie overthinking about?", 
+                                 placeholder="Example: I'm not doing well enough in my studies at Purdue...")
+    
+    if current_thought:
+        # Older Streamlit compatible approach - using radio buttons instead of tabs
+        tab_selection = st.radio("Choose your reframing approach:", 
+                               ["Self-Guided Reframing", "Bean's AI Suggestion"],
+                               key="tab_selection")
+        
+        st.markdown("---")
+        
+        # Self-Guided tab equivalent
+        if tab_selection == "Self-Guided Reframing":
+            st.markdown("### Let's examine this thought:")
+            
+            for question in questions:
+                st.text_area(question, key=question)
+            
+            reframing = get_reframing_exercise()
+            st.markdown("### Now, try reframing your thought:")
+            st.markdown(reframing)
+            
+            reframed_thought = st.text_area("Write your reframed thought here:", 
+                                         placeholder="Example: I'm working hard at Purdue and learning at my own pace. Every day I make progress, even when it's not perfect.")
+            
+            if reframed_thought:
+                if st.button("Save this reframing", key="save_self"):
+                    # Save to database
+                    db.queue_thought_entry(current_thought, reframed_thought, "self-guided",
+                                           st.session_state.user_id)
+                    st.success("Your Bean is so proud of you for reframing your thoughts! It's saved to your journal! 💖")
+        
+        # AI Suggestion tab equivalent
+        elif tab_selection == "Bean's AI Suggestion":
+            st.markdown("### Let Bean help you reframe this:")
+            st.write("I'll give this thought a fresh perspective, just like how we always talk about our future together. ❤️")
+            
+            # Offer the reframing of a similar thought from the journal instantly
+            past = read_cache.past_reframing(read_cache.for_session(st.session_state), current_thought,
+                                             st.session_state.user_id)
+            if past:
+                st.markdown("#### You've worked through a thought like this before:")
+                st.markdown(f"*{past['original']}*")
+                st.success(past['reframed'])
+            
+            # Add a button to generate AI response - older Streamlit compatible
+            if st.button("Get a fresh reframing from Bean" if past else "Get Bean's reframing",
+                         key="ai_reframe"):
+                if past:
+                    record_declined_reuse()
+
+                # Older Streamlit-friendly spinner
+                spinner_placeholder = st.empty()
+                spinner_placeholder.markdown("Bean is thinking of the perfect words for you...")
+                
+                # Replace the spinner with the response as it streams in
+                ai_reframing = ""
+                # Having turned down the past reframing, a fresh one must not
+                # be the cached reply either
+                for piece in stream_thought_reframing(current_thought, fresh=bool(past)):
+                    ai_reframing += piece
+                    spinner_placeholder.info(ai_reframing)
+                ai_reframing = ai_reframing.strip()
+                
+                # Option to save the AI reframing
+                if st.button("Save Bean's reframing to journal", key="save_ai"):
+                    # Save to database
+                    db.queue_thought_entry(current_thought, ai_reframing, "ai-suggested",
+                                           st.session_state.user_id)
+                    st.success("Bean's words of wisdom are saved to your journal! 💖")
@@ -0,0 +1,155 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# Write-behind queue: callers hand writes to a background thread and get a
+# future back straight away. The thread commits whatever has queued up in a
+# single transaction, so a burst of writes costs one commit (and one fsync)
+# instead of one per write, and writers stop contending for the database lock.
+
+# Marks the end of the queue when the writer is closed
+_STOP = object()
+
+class WriteBehindQueue:
+    """Batch writes from many threads into one transaction per batch.
+
+    A batch is written as soon as ``max_batch_size`` writes are waiting or
+    ``max_delay`` seconds after its first write arrived, whichever comes
+    first. Writes that queue up while a batch is being committed form the
+    next batch, so even with ``max_delay=0`` concurrent writers share
+    transactions without waiting for each other. ``write_batch`` takes a
+    list of queued writes, commits them in one transaction and returns one
+    result per write.
+    """
+
+    def __init__(self, write_batch, max_batch_size=100, max_delay=0.0, name="write-behind"):
+        self._write_batch = write_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, write):
+        """Queue a write.
+
+        Args:
+            write: Anything ``write_batch`` understands
+
+        Returns:
+            Future: Resolves to the write's result once it is committed
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The write-behind queue is closed")
+            self._pending += 1
+            self._queue.put((write, future))
+        return future
+
+    def flush(self, timeout=None):
+        """Wait until every write submitted so far is committed.
+
+        Returns immediately when nothing is pending.
+
+        Args:
+            timeout (float): Seconds to wait at most, None to wait forever
+        """
+        with self._lock:
+            if not self._pending or self._closed:
+                return
+            barrier = Future()
+            self._queue.put((None, barrier))
+        barrier.result(timeout)
+
+    def close(self, timeout=None):
+        """Commit everything still queued and stop the writer thread.
+
+        Args:
+            timeout (float): Seconds to wait at most, None to wait forever
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put((_STOP, None))
+        self._thread.join(timeout)
+
+    @property
+    def pending(self):
+        """Number of writes submitted but not yet committed."""
+        with self._lock:
+            return self._pending
+
+    def _run(self):
+        while True:
+            batch, barriers, stop = self._next_batch()
+            if batch:
+                self._commit(batch)
+            for barrier in barriers:
+                barrier.set_result(None)
+            if stop:
+                return
+
+    def _next_batch(self):
+        """Block for the first write, then gather more until the batch is full or due."""
+        batch, barriers = [], []
+        item = self._queue.get()
+        deadline = None
+        while True:
+            write, future = item
+            if write is _STOP:
+                return batch, barriers, True
+            if write is None:
+                # A flush() barrier: everything queued before it is in this batch
+                barriers.append(future)
+                return batch, barriers, False
+            batch.append(item)
+            if len(batch) >= self.max_batch_size:
+                return batch, barriers, False
+
+            if deadline is None:
+                deadline = time.monotonic() + self.max_delay
+            # Once the batch is due, only take writes that are already queued
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, barriers, False
+
+    def _commit(self, batch):
+        writes = [write for write, _ in batch]
+        try:
+            results = self._write_batch(writes)
+        except Exception:
+            # One bad write rolls back the whole transaction; retry each write
+            # on its own so the others are not lost with it
+            logger.exception("Batch of %d writes failed, retrying them one by one", len(batch))
+            for write, future in batch:
+                try:
+                    result = self._write_batch([write])[0]
+                except Exception as e:
+                    self._resolve(future, error=e)
+                else:
+                    self._resolve(future, result)
+            return
+        for (_, future), result in zip(batch, results):
+            self._resolve(future, result)
+
+    def _resolve(self, future, result=None, error=None):
+        with self._lock:
+            self._pending -= 1
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)